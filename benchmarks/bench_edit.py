@@ -0,0 +1,77 @@
+""" Latency of edits to a `Document`, against parsing the whole page.
+
+    Usage: python benchmarks/bench_edit.py [-s SCALE ...] [-r REPEAT]
+
+    For the "prose" page of `corpus.py` at every `SCALE`, times `REPEAT`
+    edits of a single markdown line through `Document.apply_edit`, and as
+    many whole parses of the edited page. The former should stay flat as
+    the page grows, the latter grows with it.
+"""
+## Standard Library
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
+
+## Local
+import corpus
+from mkd.mkd import mkd, Document
+from mkd.mkdparser import mkdParser
+from mkd.mkdparser.mdparser import mdParser
+
+
+def edits(doc: Document, repeat: int, seed: int) -> tuple:
+    """ Median seconds per edit through `doc`, then per whole parse.
+    """
+    rng = random.Random(seed)
+    lines = [i for i, line in enumerate(doc.lines, 1) if line.startswith("§")]
+
+    incremental = []
+    full = []
+    for _ in range(repeat):
+        lineno = rng.choice(lines)
+        text = f"§   {corpus.sentence(rng, 14, markup=0.2)}"
+
+        start = time.perf_counter()
+        doc.apply_edit((lineno, lineno + 1), text)
+        incremental.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        mkd(doc.fname, buffer=doc.text).parse()
+        full.append(time.perf_counter() - start)
+
+    return (statistics.median(incremental), statistics.median(full))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scale", type=int, nargs="+", default=[1, 4, 16], help="page size multipliers.")
+    parser.add_argument("--seed", type=int, default=0, help="random seed.")
+    parser.add_argument("-r", "--repeat", type=int, default=50, help="number of edits.")
+    args = parser.parse_args()
+
+    mkdParser.prepare()
+    mdParser.prepare()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as path:
+        os.chdir(path)
+        try:
+            print("Scale   Lines    Edit (ms)   Parse (ms)")
+            for scale in args.scale:
+                pages = corpus.generate(Path(path, f"x{scale}"), scale, args.seed)
+                doc = Document(Path(path, f"x{scale}", pages["prose"]))
+                incremental, full = edits(doc, args.repeat, args.seed)
+                print(f"{scale:>5} {len(doc.lines):>7} {1e3 * incremental:12.3f} {1e3 * full:12.3f}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
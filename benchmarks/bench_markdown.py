@@ -0,0 +1,57 @@
+""" Per-line cost of the inline markdown parser.
+
+    Usage: python benchmarks/bench_markdown.py [-n LINES]
+
+    Compares building a fresh `mdParser` for every § line (the old behaviour)
+    against borrowing one from the parser pool.
+"""
+## Standard Library
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
+
+## Local
+from mkd.mkdlib import Source
+from mkd.mkdparser.mdparser import mdParser
+
+LINE = "Texto em _itálico_ é tudo de bom. Temos também *negrito* e um [#](link) $year."
+
+
+def fresh(lines: list, symbol_table: dict):
+    for line in lines:
+        mdParser(Source.from_str(line)).parse(symbol_table=symbol_table)
+
+
+def pooled(lines: list, symbol_table: dict):
+    for line in lines:
+        with mdParser.borrow(Source.from_str(line)) as parser:
+            parser.parse(symbol_table=symbol_table)
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=500, help="number of § lines.")
+    args = parser.parse_args()
+
+    lines = [LINE] * args.n
+    symbol_table = {"year": "2021"}
+
+    ## Warm-up: builds the pooled instance once
+    pooled(lines[:1], symbol_table)
+
+    for name, func in (("fresh", fresh), ("pooled", pooled)):
+        total = timeit(func, lines, symbol_table)
+        print(f"{name:>8}: {1e6 * total / args.n:10.1f} us/line ({total:.3f} s total)")
+
+
+if __name__ == "__main__":
+    main()
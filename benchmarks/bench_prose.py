@@ -0,0 +1,63 @@
+""" Whole-file parse time for long runs of prose.
+
+    Usage: python benchmarks/bench_prose.py [-p PARAGRAPHS] [-l LINES] [-m EVERY] [-r REPEAT]
+
+    Writes a page made of `PARAGRAPHS` blocks of `LINES` adjacent § lines each,
+    one in every `EVERY` of them carrying inline markup, and reports the best
+    of `REPEAT` parses together with the markup-free fast path hit rate.
+"""
+## Standard Library
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
+
+## Local
+from mkd.mkd import mkd
+from mkd.mkdparser import mkdParser
+
+LINE = "§   Texto em _itálico_ é tudo de bom. Temos também *negrito* e um [#](link) $year."
+PLAIN = "§   Aqui vem um pouco do bom e velho markdown, sem nenhuma marcação nesta linha."
+
+
+def page(paragraphs: int, lines: int, every: int) -> str:
+    code = ["body", '$   year = "2021"']
+    for _ in range(paragraphs):
+        code.append("{   p")
+        code.extend((LINE if i % every == 0 else PLAIN) for i in range(lines))
+        code.append("}")
+    return "\n".join(code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-p", type=int, default=10, help="number of paragraphs.")
+    parser.add_argument("-l", type=int, default=200, help="§ lines per paragraph.")
+    parser.add_argument("-m", type=int, default=1, help="one markup line every M lines.")
+    parser.add_argument("-r", type=int, default=3, help="number of repetitions.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        fname = os.path.join(path, "prose.mkd")
+        with open(fname, mode="w", encoding="utf-8") as file:
+            file.write(page(args.p, args.l, args.m))
+
+        best = float("inf")
+        for _ in range(args.r):
+            start = time.perf_counter()
+            mkd(fname).parse()
+            best = min(best, time.perf_counter() - start)
+
+    total = args.p * args.l
+    stats = mkdParser.__stats__
+    rate = stats["plain"] / max(1, stats["plain"] + stats["markup"])
+    print(f"{total} lines: {best:.3f} s ({1e6 * best / total:.1f} us/line)")
+    print(f"fast path hit rate: {100 * rate:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+""" Rendering throughput with a thread pool.
+
+    Usage: python benchmarks/bench_render.py [-d DOCUMENTS] [-s SECTIONS] [-t THREADS ...]
+
+    Parses `DOCUMENTS` synthetic pages once, then renders all of them with
+    `ThreadPoolExecutor`s of each size in `THREADS`, checking that every
+    output matches the sequential one. Throughput only scales with threads on
+    free-threaded (no GIL) builds; elsewhere it shows the overhead.
+"""
+## Standard Library
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import sysconfig
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
+
+## Local
+from mkd.mkd import mkd
+
+
+def page(n: int, sections: int) -> str:
+    code = ["body", f'$   title = "Page {n}"']
+    for i in range(sections):
+        code.append(f"{{   .section #s{i}")
+        code.append("{   p")
+        code.append("§   Texto em _itálico_ é tudo de bom, $title. Temos também *negrito*.")
+        code.append("§   Aqui vem um pouco do bom e velho markdown, sem marcação.")
+        code.append("}")
+        code.append("}")
+    return "\n".join(code)
+
+
+def render(tree) -> str:
+    stream = io.StringIO()
+    tree.render(stream)
+    return stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-d", type=int, default=64, help="number of documents.")
+    parser.add_argument("-s", type=int, default=100, help="sections per document.")
+    parser.add_argument("-t", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        trees = []
+        for n in range(args.d):
+            fname = os.path.join(path, f"page{n}.mkd")
+            with open(fname, mode="w", encoding="utf-8") as file:
+                file.write(page(n, args.s))
+            trees.append(mkd(fname).parse())
+
+    expected = [render(tree) for tree in trees]
+
+    gil = "disabled" if sysconfig.get_config_var("Py_GIL_DISABLED") else "enabled"
+    print(f"{args.d} documents, GIL {gil}")
+    for threads in args.t:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            output = list(executor.map(render, trees))
+            total = time.perf_counter() - start
+        assert output == expected, "concurrent renders differ from sequential ones"
+        print(f"{threads:>3} threads: {args.d / total:8.1f} documents/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+""" Startup cost of the command line tool.
+
+    Usage: python benchmarks/bench_startup.py [PAGE] [-r REPEAT] [-b BUDGET]
+
+    Renders `PAGE` (the example site's index by default) in fresh processes:
+    once under `python -X importtime`, adding up the time spent importing
+    modules after the interpreter started, and `REPEAT` more times to measure
+    the latency of the whole command.
+
+    Exits with status 1 if the imports take longer than `BUDGET` ms, if
+    any module in `HEAVY`, which rendering a page doesn't need, is imported,
+    or if the prebuilt parser tables are stale, which makes every startup
+    build them again.
+"""
+## Standard Library
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).absolute().parents[1]
+
+## Modules that only other commands or features need
+HEAVY = (
+    "asyncio",
+    "concurrent.futures",
+    "multiprocessing",
+    "http.server",
+    "socketserver",
+    "cProfile",
+    "pickle",
+    "tempfile",
+    "cstream",
+    "mkd.aio",
+    "mkd.builder",
+    "mkd.server",
+    "mkd.codegen",
+)
+
+SCRIPT = "import sys; from mkd import main; sys.argv = ['mkd', sys.argv[1]]; main()"
+
+
+def command(page: Path, *options: str) -> tuple:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    return ([sys.executable, *options, "-c", SCRIPT, page.name], {"cwd": page.parent, "env": env})
+
+
+def imports(page: Path) -> list:
+    """ `(module, self, cumulative, depth)` of every module imported to
+        render `page`, in microseconds, as reported by `-X importtime`.
+    """
+    args, kwargs = command(page, "-X", "importtime")
+    result = subprocess.run(args, capture_output=True, text=True, check=True, **kwargs)
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, total, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(own), int(total), depth))
+    return modules
+
+
+def latency(page: Path, repeat: int) -> list:
+    args, kwargs = command(page)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, check=True, **kwargs)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def tables() -> bool:
+    """ Whether the prebuilt parser tables are up to date.
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    args = [sys.executable, "-m", "mkd.mkdparser.tables.build", "--check"]
+    return subprocess.run(args, env=env).returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("page", type=str, nargs="?", default=str(ROOT / "data" / "example" / "index.mkd"), help="page to render.")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="number of timed runs.")
+    parser.add_argument("-b", "--budget", type=float, default=120.0, help="import time budget, in ms.")
+    args = parser.parse_args()
+
+    page = Path(args.page).absolute()
+
+    modules = imports(page)
+
+    ## Interpreter startup imports come before the first `mkd` one
+    start = next(i for i, (name, *_) in enumerate(modules) if name.split(".")[0] == "mkd")
+    total = sum(cumulative for _, _, cumulative, depth in modules[start:] if depth == 0)
+
+    print("Slowest imports (self, cumulative):")
+    for name, own, cumulative, _ in sorted(modules[start:], key=lambda m: m[1], reverse=True)[:10]:
+        print(f"  {name:<40} {own / 1e3:7.2f} ms {cumulative / 1e3:8.2f} ms")
+
+    loaded = {name for name, *_ in modules}
+    heavy = [name for name in HEAVY if name in loaded]
+
+    times = latency(page, args.repeat)
+    print(f"Imports: {total / 1e3:.2f} ms (budget {args.budget:.2f} ms)")
+    print(f"Latency: median {1e3 * statistics.median(times):.2f} ms, min {1e3 * min(times):.2f} ms over {args.repeat} runs")
+
+    failed = False
+    if total / 1e3 > args.budget:
+        print("Imports are over budget.")
+        failed = True
+    if heavy:
+        print(f"Unneeded modules imported: {', '.join(heavy)}.")
+        failed = True
+    if not tables():
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
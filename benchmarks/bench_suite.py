@@ -0,0 +1,218 @@
+""" Per-phase throughput on the synthetic corpus.
+
+    Usage: python benchmarks/bench_suite.py [-s SCALE] [-r REPEAT] [-o OUTPUT] [--compare BASELINE]
+
+    Generates the corpus of `corpus.py` and, for every workload, times each
+    phase separately, keeping the best of `REPEAT` runs:
+
+        load       reading every file into a `Source`
+        mkd_lex    `mkdLexer` tokenisation of every file
+        md_lex     `mdLexer` tokenisation of the § lines
+        md_parse   `mdParser` parsing of the § lines
+        mkd_parse  whole parse, includes and inline markdown included
+        render     `html` of the parsed tree
+        compact    the same in compact mode, against the size of the
+                   default output so that both compare
+
+    Results, in bytes/s and tokens/s, are written to `OUTPUT` as JSON. With
+    `--compare`, throughput is also printed relative to an earlier result.
+"""
+## Standard Library
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
+
+## Local
+import corpus
+from mkd import __version__
+from mkd.mkd import mkd
+from mkd.items import mdContext
+from mkd.mkdlib import Source
+from mkd.mkdparser import mkdParser, include_cache
+from mkd.mkdparser.mdparser import mdParser
+
+
+def best(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def tokenize(parser: type, source: Source) -> list:
+    with parser.borrow(source) as p:
+        lexer = p.lexer.lexer
+        lexer.input(source)
+        return list(iter(lexer.token, None))
+
+
+def markdown(tokens: list) -> Source:
+    """ The § lines among `tokens`, as a single input for `mdParser`.
+    """
+    return Source.from_str("\n".join(text for t in tokens if t.type == "MARKDOWN" for text, _ in t.value))
+
+
+def phases(page: str, repeat: int) -> dict:
+    """ Timings of every phase for `page`, relative to the working directory.
+    """
+    include_cache.clear()
+    m = mkd(page)
+    m.parse()
+    files = [str(m.fname), *(path for path, version in m.depends.items() if version is not None)]
+    size = sum(os.path.getsize(path) for path in files)
+
+    sources = [Source(path) for path in files]
+    mkd_tokens = [tokenize(mkdParser, source) for source in sources]
+    texts = [markdown(tokens) for tokens in mkd_tokens]
+    texts = [text for text in texts if text]
+    md_tokens = [tokenize(mdParser, text) for text in texts]
+    md_size = sum(len(text.encode("utf-8")) for text in texts)
+    symbol_table = dict(m.symbol_table)
+
+    def load():
+        for path in files:
+            Source(path)
+
+    def mkd_lex():
+        for source in sources:
+            tokenize(mkdParser, source)
+
+    def md_lex():
+        for text in texts:
+            tokenize(mdParser, text)
+
+    def md_parse():
+        for text in texts:
+            with mdParser.borrow(text) as parser:
+                parser.parse(symbol_table=dict(symbol_table))
+
+    def mkd_parse():
+        include_cache.clear()
+        mkd(page).parse()
+
+    tree = mkd(page).parse()
+    html = tree.html
+
+    def render():
+        tree.html
+
+    def compact():
+        "".join(tree.iter_html(mdContext(compact=True)))
+
+    mkd_count = sum(map(len, mkd_tokens))
+    md_count = sum(map(len, md_tokens))
+    counts = {
+        "load": (size, None),
+        "mkd_lex": (size, mkd_count),
+        "md_lex": (md_size, md_count),
+        "md_parse": (md_size, md_count),
+        "mkd_parse": (size, mkd_count + md_count),
+        "render": (len(html.encode("utf-8")), None),
+        "compact": (len(html.encode("utf-8")), None),
+    }
+
+    results = {}
+    for name, func in (
+        ("load", load),
+        ("mkd_lex", mkd_lex),
+        ("md_lex", md_lex),
+        ("md_parse", md_parse),
+        ("mkd_parse", mkd_parse),
+        ("render", render),
+        ("compact", compact),
+    ):
+        seconds = best(func, repeat)
+        nbytes, ntokens = counts[name]
+        results[name] = {
+            "seconds": seconds,
+            "bytes": nbytes,
+            "tokens": ntokens,
+            "bytes_per_s": nbytes / seconds,
+            "tokens_per_s": ntokens / seconds if ntokens is not None else None,
+        }
+    return results
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).absolute().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scale", type=int, default=1, help="corpus size multiplier.")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of repetitions.")
+    parser.add_argument("-o", "--output", type=str, default="bench-results.json", help="JSON output file.")
+    parser.add_argument("--compare", type=str, default=None, help="earlier JSON output to compare with.")
+    args = parser.parse_args()
+
+    mkdParser.prepare()
+    mdParser.prepare()
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as path:
+        pages = corpus.generate(path, args.scale, args.seed)
+        os.chdir(path)
+        try:
+            for name, page in pages.items():
+                results[name] = phases(page, args.repeat)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "commit": commit(),
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, mode="w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare, mode="r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    for name, phases_ in results.items():
+        print(name)
+        for phase, result in phases_.items():
+            line = f"  {phase:>9}: {result['bytes_per_s'] / 2 ** 20:8.2f} MiB/s"
+            if result["tokens_per_s"] is not None:
+                line += f" {result['tokens_per_s'] / 1e3:10.1f} ktok/s"
+            else:
+                line += " " * 17
+            if baseline is not None and phase in baseline.get(name, {}):
+                ratio = result["bytes_per_s"] / baseline[name][phase]["bytes_per_s"]
+                line += f"  x{ratio:.2f}"
+            print(line)
+    print(f"Results written to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+""" Deterministic synthetic corpus for the benchmarks.
+
+    Usage: python benchmarks/corpus.py OUT [-s SCALE] [--seed SEED]
+
+    Writes one page per workload under `OUT`, the same bytes for the same
+    `SCALE` and `SEED`:
+
+        prose     long paragraphs of § lines, nearly free of markup
+        markup    § lines dense with emphasis, links and escapes
+        variables many assignments, read all over the text
+        nested    deeply nested { } blocks with classes and ids
+        fanout    a page including many files, which include a shared one
+"""
+## Standard Library
+import random
+import argparse
+from pathlib import Path
+
+WORDS = (
+    "aqui vem um pouco do bom e velho markdown texto em itálico é tudo de bom "
+    "temos também negrito least but not last some strikethrough vou acabar "
+    "botando link vamos testar os escape codes the quick brown fox jumps over "
+    "lazy dog página seção conteúdo exemplo rio de janeiro"
+).split()
+
+EFFECTS = ("_", "*", "~")
+
+ESCAPES = ("\\_", "\\*", "\\~", "\\[", "\\]", "\\(", "\\)", "\\\\")
+
+
+def sentence(rng: random.Random, words: int, markup: float = 0.0, variables: int = 0) -> str:
+    """ `words` words, each turned into markup with probability `markup` and
+        into one of `variables` variables ($v0, $v1, ...) now and then.
+    """
+    out = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if variables and rng.random() < 0.15:
+            word = f"$v{rng.randrange(variables)}"
+        elif rng.random() < markup:
+            kind = rng.randrange(5)
+            if kind < 3:
+                word = f"{EFFECTS[kind]}{word}{EFFECTS[kind]}"
+            elif kind == 3:
+                word = f"[{word}](./{rng.choice(WORDS)}.html)"
+            else:
+                word = f"{word}{rng.choice(ESCAPES)}"
+        out.append(word)
+    return " ".join(out) + "."
+
+
+def prose(rng: random.Random, scale: int) -> str:
+    code = ["body"]
+    for _ in range(50 * scale):
+        code.append("{   p")
+        code.extend(f"§   {sentence(rng, 14, markup=0.01)}" for _ in range(rng.randint(30, 70)))
+        code.append("}")
+    return "\n".join(code)
+
+
+def markup(rng: random.Random, scale: int) -> str:
+    code = ["body"]
+    for _ in range(40 * scale):
+        code.append("{   p")
+        code.extend(f"§   {sentence(rng, 14, markup=0.4)}" for _ in range(rng.randint(20, 40)))
+        code.append("}")
+    return "\n".join(code)
+
+
+def variables(rng: random.Random, scale: int) -> str:
+    count = 200
+    code = ["body"]
+    code.extend(f'$   v{i} = "{rng.choice(WORDS)} {i}"' for i in range(count))
+    for _ in range(40 * scale):
+        code.append("{   p")
+        code.extend(f"§   {sentence(rng, 14, variables=count)}" for _ in range(rng.randint(20, 40)))
+        code.append("}")
+    return "\n".join(code)
+
+
+def nested(rng: random.Random, scale: int) -> str:
+    code = ["body"]
+    for block in range(20 * scale):
+        depth = rng.randint(20, 40)
+        for level in range(depth):
+            tag = rng.choice(("", "section", "article", "span"))
+            code.append(f"{{   {tag} .level{level} .block{block} #b{block}-{level}".rstrip())
+            code.append(f"§   {sentence(rng, 6, markup=0.1)}")
+        code.extend("}" for _ in range(depth))
+    return "\n".join(code)
+
+
+def fanout(rng: random.Random, scale: int, path: Path) -> str:
+    folder = path / "fanout"
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "shared.mkd").write_text(
+        "\n".join(f"§   {sentence(rng, 10, markup=0.2)}" for _ in range(10)), encoding="utf-8"
+    )
+
+    code = ["body"]
+    for i in range(100 * scale):
+        part = [f"§   {sentence(rng, 12, markup=0.1)}" for _ in range(rng.randint(5, 15))]
+        if i % 4 == 0:
+            part.append("/   fanout/shared.mkd")
+        (folder / f"part{i}.mkd").write_text("\n".join(part), encoding="utf-8")
+        code.append(f"{{   section #part{i}")
+        code.append(f"/   fanout/part{i}.mkd")
+        code.append("}")
+    return "\n".join(code)
+
+
+def generate(path: str, scale: int = 1, seed: int = 0) -> dict:
+    """ Writes the corpus under `path`. Returns the page of each workload,
+        relative to `path`, from where its includes resolve.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    pages = {}
+    for name, func in (("prose", prose), ("markup", markup), ("variables", variables), ("nested", nested)):
+        (path / f"{name}.mkd").write_text(func(random.Random(f"{seed}:{name}"), scale), encoding="utf-8")
+        pages[name] = f"{name}.mkd"
+
+    (path / "fanout.mkd").write_text(fanout(random.Random(f"{seed}:fanout"), scale, path), encoding="utf-8")
+    pages["fanout"] = "fanout.mkd"
+
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out", type=str, help="output directory.")
+    parser.add_argument("-s", "--scale", type=int, default=1, help="size multiplier.")
+    parser.add_argument("--seed", type=int, default=0, help="random seed.")
+    args = parser.parse_args()
+
+    for name, page in generate(args.out, args.scale, args.seed).items():
+        print(f"{name:>10}: {Path(args.out, page)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,28 @@
-from .cli import main
\ No newline at end of file
+__version__ = "0.0.0"
+
+## Exported names, imported on first use along with their dependencies
+EXPORTS = {
+    "main": ".cli",
+    "compile": ".mkd",
+    "Template": ".mkd",
+    "Document": ".mkd",
+    "aparse": ".aio",
+    "acompile": ".aio",
+    "arender": ".aio",
+    "Profiler": ".mkdlib",
+}
+
+
+def __getattr__(name: str):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *EXPORTS})
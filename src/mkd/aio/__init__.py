@@ -0,0 +1 @@
+from .aio import aparse, acompile, arender
@@ -0,0 +1,110 @@
+""" Asynchronous entry points, for use from an event loop.
+"""
+## Standard Library
+import asyncio
+import functools
+from pathlib import Path
+
+## Local
+from ..mkd import mkd, Template
+from ..items import mdContext
+from ..mkdlib import Source
+from ..mkdparser import mkdParser
+from ..mkdparser.cache import stamp
+
+
+def read(path: str):
+    """ `(stamp, text)` of the file at `path`, `None` if it can't be read.
+    """
+    version = stamp(path)
+    try:
+        with open(path, mode="r", encoding="utf-8") as file:
+            return (version, file.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+async def prefetch(fname: str) -> tuple:
+    """ Reads `fname` and, level by level, every file it includes, all files
+        of a level at once. Returns the text of `fname`, `None` if it can't
+        be read, and the `(stamp, text)` pairs of its includes by path.
+    """
+    loop = asyncio.get_running_loop()
+
+    main = await loop.run_in_executor(None, read, fname)
+    if main is None:
+        return (None, {})
+
+    texts = {}
+    seen = {str(Path(fname).resolve())}
+    level = [main[1]]
+    while level:
+        paths = []
+        for text in level:
+            for ref in mkdParser.RE_INCLUDE.findall(text):
+                path = Path(ref).resolve()
+                if path.suffix in (".mkd", ".md") and str(path) not in seen:
+                    seen.add(str(path))
+                    paths.append(str(path))
+
+        results = await asyncio.gather(*(loop.run_in_executor(None, read, path) for path in paths))
+
+        level = []
+        for path, result in zip(paths, results):
+            if result is not None:
+                texts[path] = result
+                level.append(result[1])
+
+    return (main[1], texts)
+
+
+def load(fname: str, buffer: str, texts: dict, ensure_html: bool, template: bool) -> tuple:
+    """ Parses `fname`, given its text and the prefetched texts of its
+        includes. Returns the tree and the free variables of the page.
+    """
+    m = mkd(fname, buffer=buffer)
+    m.sources = {
+        path: (version, Source(path, buffer=text)) for path, (version, text) in texts.items()
+    }
+    tree = m.parse(ensure_html=ensure_html, template=template)
+    return (tree, m.variables)
+
+
+def render(fname: str, buffer: str, texts: dict, variables: dict, ensure_html: bool, compact: bool) -> str:
+    tree, _ = load(fname, buffer, texts, ensure_html, True)
+    return "".join(tree.iter_html(mdContext(variables=variables, compact=compact)))
+
+
+async def run(executor: object, func, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args))
+
+
+async def aparse(fname: str, *, ensure_html: bool = True, template: bool = False, executor: object = None):
+    """ Parses `fname` without blocking the event loop.
+
+        Files are read in the loop's default executor and parsing runs in
+        `executor`, threads by default. Since trees can be pickled, a
+        `ProcessPoolExecutor` spreads the parsing across processes. Failures
+        raise `mdError`.
+    """
+    buffer, texts = await prefetch(fname)
+    tree, _ = await run(executor, load, fname, buffer, texts, ensure_html, template)
+    return tree
+
+
+async def acompile(fname: str, *, ensure_html: bool = True, compact: bool = False, executor: object = None) -> Template:
+    """ Asynchronous `compile`.
+    """
+    buffer, texts = await prefetch(fname)
+    tree, variables = await run(executor, load, fname, buffer, texts, ensure_html, True)
+    return Template(tree, variables, compact=compact)
+
+
+async def arender(
+    fname: str, variables: dict = None, *, ensure_html: bool = True, compact: bool = False, executor: object = None
+) -> str:
+    """ Parses `fname` and renders it with the given template `variables`,
+        without blocking the event loop. See `aparse`.
+    """
+    buffer, texts = await prefetch(fname)
+    return await run(executor, render, fname, buffer, texts, variables, ensure_html, compact)
@@ -0,0 +1,126 @@
+""" Fingerprinted and inlined assets of a site build.
+"""
+## Standard Library
+import base64
+import hashlib
+import mimetypes
+from pathlib import Path
+
+
+class Assets(object):
+    """ Files that pages load with `@css`, `@js` and `@img` lines.
+
+        Each file is hashed once per build however many pages load it, and
+        its hash is kept, by stamp, for later builds. With `fingerprint`,
+        references are rewritten to a copy named after the hash, which can
+        be cached for good. Files of at most `inline` bytes are written into
+        the page instead: scripts and stylesheets as elements of their own,
+        images as `data:` URIs.
+
+        References are resolved from the directory of the page, as the
+        browser does. Those that are URLs, that leave `src` or that name a
+        file that doesn't exist are left as they are.
+    """
+
+    ## Characters of the hash kept in file names
+    DIGEST = 8
+
+    def __init__(self, src: Path, fingerprint: bool = False, inline: int = None, hashes: dict = None):
+        self.src = src
+        self.fingerprint = fingerprint
+        self.inline = inline
+
+        ## `[mtime_ns, size, digest]` of every asset hashed so far
+        self.hashes = {} if hashes is None else hashes
+
+        ## Fingerprinted copies of this build, by output path relative to `out`
+        self.files = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.fingerprint or self.inline is not None
+
+    def locate(self, name: str, ref: str):
+        """ The file that `ref`, loaded by the page `name`, stands for, or
+            `None` if it isn't a file under `src`.
+        """
+        if not ref or ref.startswith("//") or ":" in ref or "?" in ref or "#" in ref:
+            return None
+        elif ref.startswith("/"):
+            path = (self.src / ref.lstrip("/")).resolve()
+        else:
+            path = (self.src / name).parent.joinpath(ref).resolve()
+        try:
+            path.relative_to(self.src)
+        except ValueError:
+            return None
+        return path
+
+    def digest(self, path: Path, version: tuple) -> str:
+        known = self.hashes.get(str(path))
+        if known is None or tuple(known[:2]) != version:
+            known = [*version, hashlib.sha256(path.read_bytes()).hexdigest()]
+            self.hashes[str(path)] = known
+        return known[2]
+
+    def embed(self, key: str, path: Path):
+        """ `(href, text)` that write the contents of `path` into the page,
+            or `None` if they can't be.
+        """
+        data = path.read_bytes()
+        if key == "img":
+            mime, _ = mimetypes.guess_type(path.name)
+            if mime is None:
+                return None
+            return (f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}", None)
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        if key == "js" and "</script" not in text.lower():
+            return (None, text)
+        ## Relative `url()`s would resolve against the page instead
+        elif key == "css" and "</style" not in text.lower() and "url(" not in text and "@import" not in text:
+            return (None, text)
+        else:
+            return None
+
+    def link(self, key: str, ref: str, path: Path, version: tuple):
+        """ `(href, text)` that stand for `ref`: the reference to write or,
+            if `text` isn't `None`, the contents of an inline element.
+            `None` leaves `ref` as it is.
+        """
+        if self.inline is not None and version[1] <= self.inline:
+            embedded = self.embed(key, path)
+            if embedded is not None:
+                return embedded
+
+        if self.fingerprint:
+            digest = self.digest(path, version)[: self.DIGEST]
+            name = f"{path.stem}.{digest}{path.suffix}"
+            self.files[path.with_name(name).relative_to(self.src).as_posix()] = path
+            head, sep, _ = ref.rpartition("/")
+            return (f"{head}{sep}{name}", None)
+
+        return None
+
+    def page(self, name: str, loads: list, stamp) -> tuple:
+        """ Resolves the `(key, ref)` pairs that the page `name` loads, with
+            `stamp` giving the stamp of a file. Returns the `(href, text)` of
+            every reference to rewrite and the stamps of the files found,
+            for the page to be rendered again if any of them changes.
+        """
+        table = {}
+        depends = {}
+        for key, ref in loads:
+            path = self.locate(name, ref)
+            if path is None or ref in table:
+                continue
+            version = stamp(str(path))
+            depends[str(path)] = version
+            if version is None:
+                continue
+            link = self.link(key, ref, path, tuple(version))
+            if link is not None:
+                table[ref] = link
+        return (table, depends)
@@ -0,0 +1,464 @@
+""" Whole-site compilation.
+"""
+## Standard Library
+import io
+import os
+import gzip
+import json
+import time
+import hashlib
+import secrets
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+## Local
+from ..mkd import mkd
+from ..error import mdError, mdParseError
+from ..cache import ParseCache
+from ..mkdparser import mkdParser
+from ..mkdparser.mdparser import mdParser
+from ..mkdparser.cache import stamp
+from ..mkdlib import reason
+from .assets import Assets
+
+
+## Worker state
+cache = None
+options = {}
+
+
+def setup(src: str, cache_dir: str = None, build_options: dict = None):
+    """ Worker initializer: includes are resolved from the site root, just as
+        when calling `mkd` from there, and parser tables are built only once.
+    """
+    global cache, options
+
+    os.chdir(src)
+    mkdParser.prepare()
+    mdParser.prepare()
+
+    if cache_dir is not None:
+        cache = ParseCache(cache_dir)
+    options = dict(Builder.OPTIONS if build_options is None else build_options)
+
+
+def compressed(target: Path) -> Path:
+    return target.with_name(f"{target.name}.gz")
+
+
+def write(path: Path, data: bytes):
+    """ Replaces `path` with `data` atomically, through a temporary file.
+        Unlike `mkstemp`'s, it gets the default permissions, the system
+        applying the umask to its mode.
+    """
+    while True:
+        temp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, mode="wb") as file:
+            file.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def output(path: Path, data: bytes, known: list = None) -> tuple:
+    """ Writes `data` to `path`, unless its manifest entry `known` shows that
+        it holds `data` already. Returns `("written" | "skipped", entry)`,
+        where the entry is `[digest, mtime_ns, size]`.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    if known is not None and known[0] == digest and stamp(str(path)) == tuple(known[1:]):
+        return ("skipped", known)
+    write(path, data)
+    return ("written", [digest, *stamp(str(path))])
+
+
+def compile_page(name: str, out: str, known: dict = None, assets: dict = None) -> tuple:
+    """ Renders the page `name`, relative to the site root, into `out`, along
+        with its gzip-compressed copy if the "gzip" option gives a level.
+        Loader references are replaced as `assets` say.
+
+        Returns `(name, record, errors, files)`, where `record` lists what the
+        page depends on, or is `None` if it failed, and `errors` holds the
+        diagnostics of the failure. `files` maps each output file, relative
+        to `out`, to what was done with it and its new manifest entry, given
+        the `known` entries of the previous build. The worker is left ready
+        for the next page.
+    """
+    known = {} if known is None else known
+    target = Path(out, name).with_suffix(".html")
+
+    try:
+        m = mkd(name)
+        stream = io.StringIO()
+        m.render(stream, ensure_html=True, cache=cache, compact=options["compact"], assets=assets)
+        stream.write("\n")
+    except mdParseError as error:
+        return (name, None, error.diagnostics(), {})
+    except mdError as error:
+        return (name, None, [error.diagnostic()], {})
+
+    data = stream.getvalue().encode("utf-8")
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+    html = Path(name).with_suffix(".html").as_posix()
+    files[html] = output(target, data, known.get(html))
+
+    ## Compressed while the page is still in memory; `mtime=0` makes the
+    ## output depend on the page only
+    if options["gzip"] is not None:
+        data = gzip.compress(data, compresslevel=options["gzip"], mtime=0)
+        files[f"{html}.gz"] = output(compressed(target), data, known.get(f"{html}.gz"))
+    else:
+        try:
+            os.unlink(compressed(target))
+        except FileNotFoundError:
+            pass
+        else:
+            files[f"{html}.gz"] = ("deleted", None)
+
+    return (name, {"depends": m.depends, "reads": m.reads, "writes": m.writes}, [], files)
+
+
+class Builder(object):
+    """ Compiles every page found under `src` into `out`, mirroring the tree,
+        across a pool of `jobs` worker processes.
+
+        For every page, the files it reached through includes and the
+        variables it used are kept in a dependency graph saved next to the
+        output, so later builds only render pages whose sources changed.
+
+        With `compact`, pages are rendered in compact mode. With a `gzip`
+        level, from 0 to 9, each page also gets a `.html.gz` copy.
+
+        With `fingerprint`, files loaded by `@css`, `@js` and `@img` lines
+        are copied under names holding their hash, which pages refer to
+        instead, and with `inline`, those of at most that many bytes are
+        written into the pages, see `Assets`.
+
+        Output files are only written when their contents change. A manifest
+        of their hashes, next to the graph, saves reading them back to
+        compare, and the outputs of pages that no longer exist are deleted.
+    """
+
+    GRAPH = ".mkd-deps.json"
+
+    MANIFEST = ".mkd-manifest.json"
+
+    ## Output options, any change of which renders every page again
+    OPTIONS = {"compact": False, "gzip": None, "fingerprint": False, "inline": None}
+
+    def __init__(
+        self,
+        src: str,
+        out: str,
+        jobs: int = None,
+        cache_dir: str = None,
+        compact: bool = False,
+        gzip: int = None,
+        fingerprint: bool = False,
+        inline: int = None,
+    ):
+        self.src = Path(src).resolve()
+        self.out = Path(out).resolve()
+        self.jobs = jobs if jobs is not None else os.cpu_count()
+        self.cache_dir = str(Path(cache_dir).absolute()) if cache_dir is not None else None
+        self.options = {"compact": compact, "gzip": gzip, "fingerprint": fingerprint, "inline": inline}
+
+        ## Current file stamps under `src`
+        self.stamps = {}
+
+        ## Include and loader references of each source, by stamp
+        self.refs = {}
+
+        graph = self.load()
+        self.graph = graph.get("pages", {})
+        self.assets = Assets(self.src, fingerprint, inline, graph.get("assets", {}))
+
+        ## `[digest, mtime_ns, size]` of every output file, relative to `out`
+        self.manifest = self.load_manifest()
+
+    def load(self) -> dict:
+        """ The dependency graph of the last build, without its pages if it
+            was built with other options.
+        """
+        try:
+            with open(self.out / self.GRAPH, mode="r", encoding="utf-8") as file:
+                graph = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if graph.get("options", self.OPTIONS) != self.options:
+            graph.pop("pages", None)
+        return graph
+
+    def load_manifest(self) -> dict:
+        try:
+            with open(self.out / self.MANIFEST, mode="r", encoding="utf-8") as file:
+                return json.load(file)["files"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def save(self):
+        self.out.mkdir(parents=True, exist_ok=True)
+        for path, data in (
+            (
+                self.out / self.GRAPH,
+                {
+                    "src": str(self.src),
+                    "options": self.options,
+                    "pages": self.graph,
+                    "assets": {path: known for path, known in self.assets.hashes.items() if path in self.stamps},
+                },
+            ),
+            (self.out / self.MANIFEST, {"files": self.manifest}),
+        ):
+            with open(path.with_suffix(".tmp"), mode="w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(path.with_suffix(".tmp"), path)
+
+    @staticmethod
+    def outputs(name: str) -> tuple:
+        """ Output files of the page `name`, relative to `out`.
+        """
+        html = Path(name).with_suffix(".html").as_posix()
+        return (html, f"{html}.gz")
+
+    def clean(self, pages: list) -> int:
+        """ Deletes the output files of pages not among `pages`, and the
+            copies of assets no page loads anymore, returning how many there
+            were. Only files listed in the manifest, i.e. written by a
+            build, are deleted.
+        """
+        live = {path for name in pages for path in self.outputs(name)}
+        live.update(self.assets.files)
+        deleted = 0
+        for path in [path for path in self.manifest if path not in live]:
+            try:
+                os.unlink(self.out / path)
+            except FileNotFoundError:
+                pass
+            else:
+                deleted += 1
+            del self.manifest[path]
+        return deleted
+
+    def scan(self) -> dict:
+        """ Stamps of every file under `src` in a single pass of `os.scandir`
+            calls, skipping hidden directories and the output tree.
+        """
+        stamps = {}
+        stack = [str(self.src)]
+        out = str(self.out)
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    elif entry.is_dir():
+                        if entry.path != out:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        stamps[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def stamp(self, path: str):
+        if path in self.stamps:
+            return self.stamps[path]
+        elif path.startswith(str(self.src) + os.sep):
+            return None
+        else:
+            return stamp(path)
+
+    def sources(self) -> list:
+        """ Every `.mkd` file under `src`.
+        """
+        return sorted(Path(path) for path in self.stamps if path.endswith(".mkd"))
+
+    def references(self, path: Path) -> tuple:
+        """ The files that `path` includes and the `(key, ref)` pairs of its
+            loader lines. Fails with `mdError` if `path` can't be read.
+        """
+        version = self.stamps[str(path)]
+        if str(path) not in self.refs or self.refs[str(path)][0] != version:
+            try:
+                with open(path, mode="r", encoding="utf-8") as file:
+                    text = file.read()
+            except (OSError, UnicodeDecodeError) as error:
+                raise mdError(f"Can't read '{path}': {reason(error)}.") from error
+            includes = [(self.src / ref).resolve() for ref in mkdParser.RE_INCLUDE.findall(text)]
+            self.refs[str(path)] = (version, includes, mkdParser.RE_LOADER.findall(text))
+        return self.refs[str(path)][1:]
+
+    def includes(self, path: Path) -> list:
+        return self.references(path)[0]
+
+    def loads(self, name: str) -> list:
+        """ The `(key, ref)` pairs of the loader lines of the page `name` and
+            of every source it includes, directly or not.
+        """
+        loads = []
+        seen = set()
+        stack = [self.src / name]
+        while stack:
+            path = stack.pop()
+            if str(path) in seen or str(path) not in self.stamps or path.suffix != ".mkd":
+                continue
+            seen.add(str(path))
+            try:
+                includes, refs = self.references(path)
+            except mdError:
+                ## Reported by the build of the page
+                continue
+            loads.extend(refs)
+            stack.extend(includes)
+        return loads
+
+    def publish(self) -> Counter:
+        """ Copies the assets fingerprinted in this build into `out`, unless
+            the manifest shows that they are there already: their names hold
+            their hash, so they can't have changed.
+        """
+        files = Counter()
+        for name, path in self.assets.files.items():
+            target = self.out / name
+            known = self.manifest.get(name)
+            if known is not None and stamp(str(target)) == tuple(known[1:]):
+                files["skipped"] += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            action, self.manifest[name] = output(target, path.read_bytes(), known)
+            files[action] += 1
+        return files
+
+    def pages(self) -> list:
+        """ Top-level pages, i.e. `.mkd` files that no other file includes,
+            relative to `src`.
+        """
+        sources = self.sources()
+        included = set()
+        for path in sources:
+            try:
+                included.update(self.includes(path))
+            except mdError:
+                ## Built as a page, which reports the error
+                continue
+        return [
+            path.relative_to(self.src).as_posix()
+            for path in sources
+            if path not in included
+        ]
+
+    def dirty(self, name: str) -> bool:
+        """ Whether the page `name` has to be rendered again.
+        """
+        record = self.graph.get(name)
+        target = (self.out / name).with_suffix(".html")
+        if record is None or not target.exists():
+            return True
+        elif self.options["gzip"] is not None and not compressed(target).exists():
+            return True
+        elif self.stamp(str(self.src / name)) != tuple(record["stamp"]):
+            return True
+        else:
+            return any(
+                self.stamp(path) != (tuple(value) if value is not None else None)
+                for path, value in record["depends"].items()
+            )
+
+    def executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=setup, initargs=(str(self.src), self.cache_dir, self.options)
+        )
+
+    def build(self, executor: ProcessPoolExecutor = None, stamps: dict = None) -> dict:
+        """ Compiles all pages whose dependencies changed since the last
+            build, returning a summary of the run.
+        """
+        if executor is None:
+            with self.executor() as executor:
+                return self.build(executor, stamps)
+
+        start = time.perf_counter()
+        self.stamps = self.scan() if stamps is None else stamps
+        pages = self.pages()
+        dirty = [name for name in pages if self.dirty(name)]
+
+        ## Every page, dirty or not, for the copies its assets need
+        assets = {}
+        self.assets.files = {}
+        if self.assets.enabled:
+            for name in pages:
+                assets[name] = self.assets.page(name, self.loads(name), self.stamp)
+
+        graph = {name: self.graph[name] for name in pages if name in self.graph}
+        failed = []
+        errors = {}
+        files = Counter()
+        futures = [
+            executor.submit(
+                compile_page,
+                name,
+                str(self.out),
+                {path: self.manifest[path] for path in self.outputs(name) if path in self.manifest},
+                assets[name][0] if name in assets else None,
+            )
+            for name in dirty
+        ]
+        for future in futures:
+            name, record, diagnostics, outputs = future.result()
+            for path, (action, entry) in outputs.items():
+                files[action] += 1
+                if entry is None:
+                    self.manifest.pop(path, None)
+                else:
+                    self.manifest[path] = entry
+            if record is None:
+                failed.append(name)
+                errors[name] = diagnostics
+                graph.pop(name, None)
+            else:
+                record["stamp"] = self.stamps[str(self.src / name)]
+                if name in assets:
+                    record["depends"].update(assets[name][1])
+                graph[name] = record
+        self.graph = graph
+        files.update(self.publish())
+        files["deleted"] += self.clean(pages)
+        self.save()
+
+        elapsed = time.perf_counter() - start
+        built = len(dirty) - len(failed)
+        return {
+            "pages": len(pages),
+            "built": built,
+            "skipped": len(pages) - len(dirty),
+            "failed": failed,
+            "errors": errors,
+            "written": files["written"],
+            "unchanged": files["skipped"],
+            "deleted": files["deleted"],
+            "time": elapsed,
+            "rate": built / elapsed if elapsed else 0.0,
+        }
+
+    def watch(self, interval: float = 0.5):
+        """ Polls `src` every `interval` seconds, yielding the summary of
+            each rebuild. Worker processes and their caches stay warm.
+        """
+        with self.executor() as executor:
+            previous = None
+            while True:
+                stamps = self.scan()
+                if stamps != previous:
+                    yield self.build(executor, stamps)
+                    previous = stamps
+                time.sleep(interval)
@@ -0,0 +1,178 @@
+""" On-disk cache of parse results, shared across runs.
+"""
+## Standard Library
+import os
+import hashlib
+from pathlib import Path
+
+## Local
+from .. import __version__
+from ..mkdlib import Source
+from ..mkdparser import mkdParser
+from ..mkdparser.mdparser import mdParser
+from ..mkdparser.cache import stamp
+
+
+def digest(path: str) -> str:
+    with open(path, mode="rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class ParseCache(object):
+    """ Parse trees and rendered output, stored under `path` and keyed by the
+        source contents, the `mkd` version and the grammar version.
+
+        Every entry also records the files reached through includes, by stamp
+        and content hash, and is only used while all of them are unchanged.
+        Once the entries add up to more than `max_size` bytes, the least
+        recently used ones are evicted.
+    """
+
+    PATH = ".mkd-cache"
+    SUFFIX = ".pickle"
+
+    def __init__(self, path: str = PATH, max_size: int = 256 * 2 ** 20):
+        self.path = Path(path).absolute()
+        self.max_size = max_size
+        self.size = None
+        self.grammar = hashlib.sha256(
+            (mkdParser.signature() + mdParser.signature()).encode("utf-8")
+        ).hexdigest()
+
+    def key(self, source: Source, ensure_html: bool, template: bool = False) -> str:
+        """ Includes are resolved from the working directory, so it is part
+            of the key as well.
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            f"{__version__}\n{self.grammar}\n{os.getcwd()}\n{ensure_html}\n{template}\n".encode("utf-8")
+        )
+        digest.update(str(source).encode("utf-8"))
+        return digest.hexdigest()
+
+    def fname(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}{self.SUFFIX}"
+
+    def load(self, key: str):
+        """ Returns the entry stored under `key`, `None` if there is none or
+            if any of its dependencies changed. Dependencies that were only
+            touched are stamped again, in the entry returned and on disk.
+        """
+        import pickle
+
+        fname = self.fname(key)
+        try:
+            with open(fname, mode="rb") as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+        touched = False
+        for path, (version, content) in entry["depends"].items():
+            current = stamp(path)
+            if current == (tuple(version) if version is not None else None):
+                continue
+            elif current is None or version is None or digest(path) != content:
+                return None
+            entry["depends"][path] = (current, content)
+            touched = True
+
+        try:
+            if touched:
+                self.dump(fname, entry)
+            else:
+                os.utime(fname)
+        except OSError:
+            pass
+
+        return entry
+
+    def dump(self, fname: Path, entry: dict) -> int:
+        """ Writes `entry` to `fname` atomically, returns its size.
+        """
+        import pickle
+        import tempfile
+
+        fname.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=fname.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode="wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+            os.replace(temp, fname)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        return size
+
+    def store(self, key: str, entry: dict):
+        """ Writes `entry`, whose "depends" maps paths to the stamps seen
+            while parsing. Nothing is stored if any of them changed since.
+        """
+        depends = {}
+        for path, version in entry["depends"].items():
+            if stamp(path) != version:
+                return
+            depends[path] = (version, digest(path) if version is not None else None)
+
+        size = self.dump(self.fname(key), {**entry, "depends": depends})
+
+        ## Running estimate, made exact again by `evict`
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self.entries())
+        else:
+            self.size += size
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def entries(self) -> list:
+        """ `(mtime, size, path)` of every entry, least recently used first.
+        """
+        entries = []
+        if not self.path.is_dir():
+            return entries
+        for folder in os.scandir(self.path):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self.size = total
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for _, _, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.size = 0
+        return len(entries)
+
+    def stats(self) -> dict:
+        entries = self.entries()
+        return {
+            "path": str(self.path),
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "max_size": self.max_size,
+        }
@@ -1,13 +1,19 @@
 """ md: A Markdown pill
 """
+import sys
 import argparse
+from contextlib import nullcontext
 
-from cstream import stdout, stdlog
+from ..mkdlib import Profiler, stdout, stderr, stdlog
+from ..cache import ParseCache
 
-from ..mkd import mkd
+## Each command imports what it needs, see `python -X importtime`
 
 
 def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
     params = {"description": __doc__}
 
     parser = argparse.ArgumentParser(**params)
@@ -16,17 +22,178 @@ def main() -> int:
     group.add_argument("--html", action="store_true", help="Ensures HTML output.")
     group.add_argument("--tokens", action="store_true", help=argparse.SUPPRESS)
     
+    parser.add_argument(
+        "--cache-dir", type=str, nargs="?", const=ParseCache.PATH, default=None,
+        help=f"reuse parse results stored in this directory (default: {ParseCache.PATH}).",
+    )
+    parser.add_argument("--compact", action="store_true", help="no indentation nor needless whitespace.")
+    parser.add_argument("--profile", action="store_true", help="report time per phase and counters to stderr.")
+    parser.add_argument(
+        "--profile-phase", type=str, choices=Profiler.PHASES, default=None,
+        help="run cProfile during this phase only (implies --profile).",
+    )
+    parser.add_argument(
+        "--profile-out", type=str, default="mkd.pstats", help="pstats output of --profile-phase (default: mkd.pstats).",
+    )
     parser.add_argument("--debug", action="store_true", help=argparse.SUPPRESS)
     args = parser.parse_args()
 
-    m = mkd(args.source)
-
-    if args.tokens:
-        stdout[0] << m.tokens()
+    if args.profile or args.profile_phase is not None:
+        profiler = Profiler(args.profile_phase)
     else:
-        stdout[0] << m.parse(ensure_html=args.html).html
+        profiler = None
+
+    from ..mkd import mkd
+    from ..error import mdError
+
+    try:
+        with profiler if profiler is not None else nullcontext():
+            m = mkd(args.source)
+
+            if args.tokens:
+                stdout[0] << m.tokens()
+            else:
+                cache = ParseCache(args.cache_dir) if args.cache_dir is not None else None
+                m.render(sys.stdout, ensure_html=args.html, cache=cache, compact=args.compact)
+                sys.stdout.write("\n")
+    except mdError as error:
+        stderr << error
+        return 1
 
     if args.debug:
-        stdlog[0] << m.parser.symbol_table
+        stdlog[0] << m.symbol_table
+
+    ## cstream writes to stdout, which holds the output
+    if profiler is not None:
+        print(profiler.summary(), file=sys.stderr)
+        if args.profile_phase is not None:
+            profiler.dump_stats(args.profile_out)
+            print(f"cProfile stats of phase '{args.profile_phase}' written to '{args.profile_out}'.", file=sys.stderr)
+
+    return 0
+
+
+def build(argv: list) -> int:
+    """ mkd build: compiles every page of a site
+    """
+    params = {"prog": "mkd build", "description": build.__doc__}
+
+    parser = argparse.ArgumentParser(**params)
+    parser.add_argument("src", type=str, action="store", help="site root directory.")
+    parser.add_argument("out", type=str, action="store", help="output directory.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes.")
+    parser.add_argument("--watch", action="store_true", help="rebuild pages as their sources change.")
+    parser.add_argument("--interval", type=float, default=0.5, help="polling interval for --watch, in seconds.")
+    parser.add_argument("--compact", action="store_true", help="no indentation nor needless whitespace.")
+    parser.add_argument(
+        "--gzip", type=int, nargs="?", const=9, default=None, choices=range(10), metavar="LEVEL",
+        help="also write a .html.gz copy of every page, at this compression level (default: 9).",
+    )
+    parser.add_argument(
+        "--fingerprint", action="store_true", help="refer to copies of loaded assets named after their hash.",
+    )
+    parser.add_argument(
+        "--inline", type=int, default=None, metavar="BYTES",
+        help="write loaded assets of at most this many bytes into the pages.",
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, nargs="?", const=ParseCache.PATH, default=None,
+        help=f"reuse parse results stored in this directory (default: {ParseCache.PATH}).",
+    )
+    args = parser.parse_args(argv)
+
+    from ..builder import Builder
+
+    builder = Builder(
+        args.src,
+        args.out,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        compact=args.compact,
+        gzip=args.gzip,
+        fingerprint=args.fingerprint,
+        inline=args.inline,
+    )
+
+    if args.watch:
+        try:
+            for summary in builder.watch(interval=args.interval):
+                report(summary)
+        except KeyboardInterrupt:
+            return 0
+    else:
+        summary = builder.build()
+        report(summary)
+        return 1 if summary["failed"] else 0
+
+
+def report(summary: dict):
+    for name in summary["failed"]:
+        stderr << f"Failed to build '{name}'."
+        for error in summary["errors"].get(name, ()):
+            where = ":".join(str(error[key]) for key in ("file", "line", "column") if error[key] is not None)
+            stderr << f"  {where + ': ' if where else ''}{error['kind']}: {error['message']}"
+
+    stdout << (
+        f"Built {summary['built']}/{summary['pages']} pages "
+        f"({summary['skipped']} up to date) in {summary['time']:.3f}s "
+        f"({summary['rate']:.1f} pages/s). Files: {summary['written']} written, "
+        f"{summary['unchanged']} unchanged, {summary['deleted']} deleted."
+    )
+
+
+def cache(argv: list) -> int:
+    """ mkd cache: inspects or empties the parse cache
+    """
+    params = {"prog": "mkd cache", "description": cache.__doc__}
+
+    parser = argparse.ArgumentParser(**params)
+    parser.add_argument("action", choices=["stats", "clear"], help="what to do.")
+    parser.add_argument("--cache-dir", type=str, default=ParseCache.PATH, help="cache directory.")
+    args = parser.parse_args(argv)
+
+    parse_cache = ParseCache(args.cache_dir)
+
+    if args.action == "stats":
+        stats = parse_cache.stats()
+        stdout << f"{stats['path']}: {stats['entries']} entries, {stats['size']} bytes (limit {stats['max_size']})."
+    else:
+        stdout << f"Removed {parse_cache.clear()} entries from {parse_cache.path}."
+
+    return 0
+
+
+def serve(argv: list) -> int:
+    """ mkd serve: renders the pages of a site on request
+    """
+    params = {"prog": "mkd serve", "description": serve.__doc__}
+
+    parser = argparse.ArgumentParser(**params)
+    parser.add_argument("root", type=str, action="store", help="site root directory.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="address to listen on.")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="port to listen on.")
+    parser.add_argument("--max-size", type=int, default=64, help="size of the rendered page cache, in MiB.")
+    parser.add_argument("--compact", action="store_true", help="no indentation nor needless whitespace.")
+    parser.add_argument(
+        "--cache-dir", type=str, nargs="?", const=ParseCache.PATH, default=None,
+        help=f"reuse parse results stored in this directory (default: {ParseCache.PATH}).",
+    )
+    args = parser.parse_args(argv)
+
+    from ..server import Server
+
+    with Server(
+        args.root, (args.host, args.port), max_size=args.max_size * 2 ** 20, cache_dir=args.cache_dir,
+        compact=args.compact,
+    ) as server:
+        host, port = server.server_address[:2]
+        stdout << f"Serving '{server.root}' at http://{host}:{port}/"
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
 
-    return 0
\ No newline at end of file
+COMMANDS = {"build": build, "cache": cache, "serve": serve}
@@ -0,0 +1,121 @@
+""" Compilation of parsed documents into Python render functions.
+"""
+## Standard Library
+import os
+import marshal
+import tempfile
+import importlib.util
+
+## Local
+from .. import __version__
+from ..items import mdContext
+
+
+class Slot(str):
+    """ Stands for the value of a template variable among the chunks.
+    """
+
+    def __new__(cls, name: str):
+        slot = str.__new__(cls, "")
+        slot.name = name
+        return slot
+
+
+class SlotContext(mdContext):
+    """ Render context that leaves every variable as a `Slot`.
+    """
+
+    def variable(self, name: str) -> str:
+        return Slot(name)
+
+
+def value(variables: dict, name: str) -> str:
+    item = variables.get(name)
+    return str() if item is None else str(item)
+
+
+def parts(tree: object, compact: bool = False) -> list:
+    """ Output of `tree` as constant strings and `Slot`s, merging adjacent
+        constants.
+    """
+    output = []
+    chunks = []
+    for chunk in tree.iter_html(SlotContext(compact=compact)):
+        if isinstance(chunk, Slot):
+            if chunks:
+                output.append("".join(chunks))
+                chunks.clear()
+            output.append(chunk)
+        else:
+            chunks.append(chunk)
+    if chunks or not output:
+        output.append("".join(chunks))
+    return output
+
+
+def generate(tree: object, compact: bool = False) -> str:
+    """ Python source of a module defining `render(variables)`.
+    """
+    items = [
+        f"value(variables, {part.name!r})" if isinstance(part, Slot) else repr(part)
+        for part in parts(tree, compact)
+    ]
+    if len(items) == 1:
+        body = f"    return {items[0]}\n"
+    else:
+        body = "    return ''.join((\n" + "".join(f"        {item},\n" for item in items) + "    ))\n"
+    return f"def render(variables):\n{body}"
+
+
+class Renderer(object):
+    """ A document compiled into a Python function that returns its output,
+        given the values of its template variables.
+
+        Static output is kept as constant strings, so rendering amounts to a
+        single join. The code object can be saved and loaded back, like a
+        `.pyc` file, by `dump` and `load`.
+    """
+
+    MAGIC = importlib.util.MAGIC_NUMBER + f"mkd {__version__}\n".encode("utf-8")
+
+    def __init__(self, code: object):
+        self.code = code
+        namespace = {"value": value}
+        exec(code, namespace)
+        self.function = namespace["render"]
+
+    @classmethod
+    def from_tree(cls, tree: object, fname: str = "<mkd>", compact: bool = False):
+        return cls(compile(generate(tree, compact), fname, "exec"))
+
+    def __call__(self, variables: dict = None) -> str:
+        return self.function({} if variables is None else variables)
+
+    def dump(self, path: str):
+        """ Writes the code object to `path`, atomically.
+        """
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, temp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode="wb") as file:
+                file.write(self.MAGIC)
+                marshal.dump(self.code, file)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @classmethod
+    def load(cls, path: str):
+        """ Reads back a code object written by `dump`. Returns `None` if
+            there is none, or if it was written by another Python or `mkd`
+            version.
+        """
+        try:
+            with open(path, mode="rb") as file:
+                if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                    return None
+                code = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return cls(code)
@@ -19,13 +19,66 @@ class mdError(Exception):
             else:
                 return (
                     f"In '{self.target.source.fname}' at line {self.target.lineno}:\n"
-                    f"{self.target.source.lines[self.target.lineno]}\n"
+                    f"{self.target.source.line(self.target.lineno)}\n"
                     f"{' ' * self.target.chrpos}^\n"
                     f"{self.__class__.__doc__}: {self.msg}\n"
                 )
         else:
             return self.msg
 
+    @property
+    def fname(self):
+        """ File the error was found in, `None` if unknown.
+        """
+        if self.target is not None and hasattr(self.target, "lexinfo") and self.target.source is not None:
+            return self.target.source.fname
+        return None
+
+    @property
+    def lineno(self):
+        if self.target is not None and hasattr(self.target, "lexinfo"):
+            return self.target.lineno
+        return None
+
+    @property
+    def column(self):
+        if self.target is not None and hasattr(self.target, "lexinfo"):
+            return self.target.chrpos
+        return None
+
+    def diagnostic(self) -> dict:
+        """ Plain description of the error, safe to pickle or dump as JSON
+            (unlike the error itself, which holds on to its source).
+        """
+        return {
+            "kind": self.__class__.__doc__,
+            "file": self.fname,
+            "line": self.lineno,
+            "column": self.column,
+            "message": self.msg,
+        }
+
+
+class mdParseError(mdError):
+    "Parse Error"
+
+    def __init__(self, errors: list):
+        """ Every error found while parsing a file, in the order they were
+            found, including those of the files it includes.
+        """
+        mdError.__init__(self, f"{len(errors)} error(s).")
+        self.errors = list(errors)
+
+    def __str__(self):
+        return "\n".join(map(str, self.errors))
+
+    def diagnostics(self) -> list:
+        return [error.diagnostic() for error in self.errors]
+
 
 class mdSyntaxError(mdError):
-    "Syntax Error"
\ No newline at end of file
+    "Syntax Error"
+
+
+class mdIncludeError(mdError):
+    "Include Error"
\ No newline at end of file
@@ -1,61 +1,152 @@
 # Standard Library
 import abc
 import html
+from contextlib import contextmanager
 
 from ..mkdlib import trackable
 
 
+class mdContext(object):
+    """ State of a single render: indentation depth, padding cache, the
+        values of template variables and output options. Each render owns
+        one, so documents can be rendered concurrently and a failed render
+        leaves nothing behind.
+
+        With the `compact` option, nothing is indented and whitespace is
+        only written where a browser would render it: a single space between
+        inline contents, none around block-level elements. `NEUTRAL` elements,
+        which aren't rendered, are skipped over: the space between their
+        neighbours is kept, and written after them. The contents of
+        `PRESERVE` elements are written as in the default mode.
+
+        The `assets` option maps references of `@css`, `@js` and `@img`
+        lines to the `(href, text)` that replace them, see `mdLoader`.
+    """
+
+    TAB = "\t"
+
+    ## Elements whose whitespace is significant
+    PRESERVE = frozenset(("pre", "textarea"))
+
+    ## Block-level elements, around which whitespace renders as nothing
+    BLOCK = frozenset((
+        "html", "head", "body", "title",
+        "address", "article", "aside", "blockquote", "dd", "details", "dialog",
+        "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+        "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "li",
+        "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tbody",
+        "td", "tfoot", "th", "thead", "tr", "ul",
+    ))
+
+    ## Elements that aren't rendered, thus neither inline nor block-level
+    NEUTRAL = frozenset(("meta", "link", "script", "style"))
+
+    def __init__(self, variables: dict = None, **options):
+        self.depth = 0
+        self.pads = [""]
+        self.variables = {} if variables is None else variables
+        self.options = options
+        self.compact = bool(options.get("compact", False))
+        self.assets = options.get("assets")
+
+    def variable(self, name: str) -> str:
+        value = self.variables.get(name)
+        return str() if value is None else str(value)
+
+    @property
+    def pad(self) -> str:
+        while len(self.pads) <= self.depth:
+            self.pads.append(self.TAB * len(self.pads))
+        return self.pads[self.depth]
+
+    @contextmanager
+    def indent(self):
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    @contextmanager
+    def expanded(self):
+        """ Leaves compact mode within the block.
+        """
+        compact, self.compact = self.compact, False
+        try:
+            yield
+        finally:
+            self.compact = compact
+
+    def spaced(self, items: list, outer: bool = True):
+        """ Compact chunks of `items`, with a space between inline neighbours.
+            `outer` tells whether they sit within a block-level element,
+            otherwise the edges are spaced as well.
+        """
+        previous = outer
+        for item in items:
+            if item.neutral:
+                yield from item.chunks(self)
+                continue
+            block = item.block
+            if not (previous or block):
+                yield " "
+            yield from item.chunks(self)
+            previous = block
+        if not (previous or outer):
+            yield " "
+
+
 @trackable
 class mdType(object, metaclass=abc.ABCMeta):
-    """"""
+    """ Items are `__slots__` classes, most of them with no attributes but
+        `_data` and `_lexinfo`. Since some are also `list` subclasses, these
+        slots are declared by each concrete class instead of here.
 
-    TAB = "\t"
+        `_data`, holding "id", "class" and other attributes, is only allocated
+        for items given one, as is `_lexinfo` for tracked ones.
+    """
+
+    __slots__ = ()
 
     __inline__ = False
 
-    __data__ = {"stack": 0}
+    ## Whether the output is a block-level element, or one that isn't
+    ## rendered, see `mdContext`
+    block = False
+    neutral = False
+
+    DATA = {"id": "", "class": ""}
 
     def __init__(self):
-        self._data = {"id": "", "class": ""}
+        pass
+
+    @property
+    def data(self) -> dict:
+        try:
+            return self._data
+        except AttributeError:
+            self._data = dict(self.DATA)
+            return self._data
 
     def __getitem__(self, key: str):
-        return self._data[key]
+        return getattr(self, "_data", self.DATA)[key]
 
     def __setitem__(self, key: str, value: object):
-        self._data[key] = value
+        self.data[key] = value
 
     def update(self, d: dict):
         for key, value in d.items():
-            self._data[key] = value
+            self.data[key] = value
 
     def __bool__(self) -> bool:
         return True
 
-    @property
-    def pad(self):
-        return self.TAB * self.__data__["stack"]
-
-    @property
-    def reset(self):
-        self.__class__.__data__["stack"] = 0
-        return str()
-
-    @property
-    def push(self) -> str:
-        self.__class__.__data__["stack"] += 1
-        return str()
-
-    @property
-    def pop(self) -> str:
-        self.__class__.__data__["stack"] -= 1
-        return str()
-
     def get_key(self, key: str) -> str:
         return f' {key}="{self[key]}"' if bool(self[key]) else str()
 
     @property
     def keys(self) -> str:
-        return "".join(self.get_key(key) for key in self._data)
+        return "".join(self.get_key(key) for key in getattr(self, "_data", ()))
 
     @property
     def inline(self):
@@ -65,6 +156,23 @@ class mdType(object, metaclass=abc.ABCMeta):
     def html(self) -> str:
         pass
 
+    def iter_html(self, ctx: mdContext = None):
+        """ Yields the HTML output in chunks, depth-first.
+        """
+        return self.chunks(mdContext() if ctx is None else ctx)
+
+    def chunks(self, ctx: mdContext):
+        """ Rendering hook: items holding other items override this one,
+            threading `ctx` down to their children.
+        """
+        yield self.html
+
+    def render(self, stream, ctx: mdContext = None):
+        """ Writes the HTML output to `stream`, chunk by chunk.
+        """
+        for chunk in self.iter_html(ctx):
+            stream.write(chunk)
+
     @property
     def child(self) -> list:
         return None
@@ -75,6 +183,8 @@ class mdType(object, metaclass=abc.ABCMeta):
 
 
 class mdNull(mdType):
+    __slots__ = ("_data", "_lexinfo")
+
     __ref__ = None
 
     __inline__ = False
@@ -98,6 +208,8 @@ class mdNull(mdType):
 class mdContents(list, mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo")
+
     def __init__(self, *contents: tuple):
         list.__init__(self, [c for c in contents if c])
         mdType.__init__(self)
@@ -107,7 +219,24 @@ class mdContents(list, mdType):
 
     @property
     def html(self):
-        return f"\n{self.pad}".join(f"{c.html}" for c in self)
+        return "".join(self.iter_html())
+
+    @property
+    def block(self) -> bool:
+        return not self.neutral and all(c.block or c.neutral for c in self)
+
+    @property
+    def neutral(self) -> bool:
+        return all(c.neutral for c in self)
+
+    def chunks(self, ctx: mdContext):
+        if ctx.compact:
+            yield from ctx.spaced(self)
+            return
+        for i, c in enumerate(self):
+            if i:
+                yield f"\n{ctx.pad}"
+            yield from c.chunks(ctx)
 
     @property
     def child(self) -> list:
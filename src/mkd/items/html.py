@@ -1,8 +1,8 @@
 import abc
 
-from cstream import stdwar
+from ..mkdlib import stdwar
 
-from .base import mdType
+from .base import mdType, mdContext
 from .text import mdText
 from .tags import mdTag
 
@@ -10,6 +10,8 @@ from .tags import mdTag
 class mdRawHTML(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "text")
+
     def __init__(self, text: str):
         self.text = text
 
@@ -25,29 +27,44 @@ class mdRawHTML(mdType):
 class mdHTML(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "content")
+
     def __init__(self, *content: tuple):
         mdType.__init__(self)
         self.content = [c for c in content if c]
 
+    block = True
+
     @property
     def meta(self) -> str:
         return "<!DOCTYPE html>"
 
     @property
     def html(self) -> str:
-        return "\n".join(
-            [
-                f"{self.meta}",
-                f"<html>{self.push}",
-                *[f"{self.pad}{c.html}" for c in self.content],
-                f"{self.pop}{self.pad}</html>",
-            ]
-        )
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        if ctx.compact:
+            yield f"{self.meta}<html>"
+            with ctx.indent():
+                yield from ctx.spaced(self.content)
+            yield "</html>"
+            return
+        yield f"{self.meta}\n<html>"
+        with ctx.indent():
+            for c in self.content:
+                yield f"\n{ctx.pad}"
+                yield from c.chunks(ctx)
+        yield f"\n{ctx.pad}</html>"
 
 
 class mdHead(mdTag):
     """"""
 
+    __slots__ = ()
+
+    block = True
+
     @property
     def tag(self):
         return f"head"
@@ -56,6 +73,10 @@ class mdHead(mdTag):
 class mdBody(mdTag):
     """"""
 
+    __slots__ = ()
+
+    block = True
+
     @property
     def tag(self):
         return f"body"
@@ -64,6 +85,10 @@ class mdBody(mdTag):
 class mdDiv(mdTag):
     """"""
 
+    __slots__ = ()
+
+    block = True
+
     @property
     def tag(self):
         return f"div"
@@ -73,8 +98,12 @@ class mdDiv(mdTag):
 class mdHeader(mdTag):
     """"""
 
+    __slots__ = ()
+
     __inline__ = True
 
+    block = True
+
     @abc.abstractproperty
     def heading(self) -> int:
         pass
@@ -87,6 +116,8 @@ class mdHeader(mdTag):
 class mdHeader1(mdHeader):
     """"""
 
+    __slots__ = ()
+
     @property
     def heading(self) -> int:
         return 1
@@ -95,6 +126,8 @@ class mdHeader1(mdHeader):
 class mdHeader2(mdHeader):
     """"""
 
+    __slots__ = ()
+
     @property
     def heading(self) -> int:
         return 2
@@ -103,6 +136,8 @@ class mdHeader2(mdHeader):
 class mdHeader3(mdHeader):
     """"""
 
+    __slots__ = ()
+
     @property
     def heading(self) -> int:
         return 3
@@ -111,6 +146,8 @@ class mdHeader3(mdHeader):
 class mdHeader4(mdHeader):
     """"""
 
+    __slots__ = ()
+
     @property
     def heading(self) -> int:
         return 4
@@ -119,37 +156,76 @@ class mdHeader4(mdHeader):
 class mdLink(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "ref", "text")
+
     def __init__(self, ref: mdText, text: mdText):
         self.ref = ref
         self.text = text
 
+    ATTRS = ""
+
     @property
     def html(self) -> str:
-        return f'<a href="{self.ref.html}"> {self.text.html} </a>'
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        yield '<a href="'
+        yield from self.ref.chunks(ctx)
+        if ctx.compact:
+            yield f'"{self.ATTRS}>'
+            yield from self.text.chunks(ctx)
+            yield "</a>"
+        else:
+            yield f'"{self.ATTRS}> '
+            yield from self.text.chunks(ctx)
+            yield " </a>"
 
 class mdXLink(mdLink):
     """"""
 
-    @property
-    def html(self) -> str:
-        return f'<a href="{self.ref.html}" target="_blank" rel="noopener noreferrer"> {self.text.html} </a>'
+    __slots__ = ()
+
+    ATTRS = ' target="_blank" rel="noopener noreferrer"'
 
 class mdLoader(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "ref", "key")
+
     def __init__(self, ref: str, key: str):
         mdType.__init__(self)
         self.ref = ref
         self.key = key
 
+    @property
+    def neutral(self) -> bool:
+        return self.key in ("js", "css")
+
     @property
     def html(self) -> str:
+        return self.element(self.ref)
+
+    def element(self, ref: str, text: str = None) -> str:
+        """ The element loading `ref`, or holding `text` if it is given.
+        """
         if self.key == "js":
-            return f'<script type="text/javascript" src="{self.ref}"></script>'
+            if text is not None:
+                return f'<script type="text/javascript">{text}</script>'
+            return f'<script type="text/javascript" src="{ref}"></script>'
         elif self.key == "css":
-            return f'<link rel="stylesheet" href="{self.ref}">'
+            if text is not None:
+                return f"<style>{text}</style>"
+            return f'<link rel="stylesheet" href="{ref}">'
         elif self.key == "img":
-            return f'<img src="{self.ref}">'
+            return f'<img src="{ref}">'
         else:
             stdwar[0] << f"Invalid loader '{self.key}'."
-            return str()
\ No newline at end of file
+            return str()
+
+    def chunks(self, ctx: mdContext):
+        """ Rewritten as the `assets` of the render say, if any.
+        """
+        if ctx.assets is not None and self.ref in ctx.assets:
+            yield self.element(*ctx.assets[self.ref])
+        else:
+            yield self.html
\ No newline at end of file
@@ -1,12 +1,14 @@
 import abc
 
-from .base import mdType
+from .base import mdType, mdContext
 from .tags import mdTag
 
 # Lists
 class mdList(list, mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo")
+
     def __init__(self, *content: tuple):
         list.__init__(self, content)
         mdType.__init__(self)
@@ -15,15 +17,22 @@ class mdList(list, mdType):
     def tag(self) -> str:
         pass
 
+    block = True
+
     @property
     def html(self) -> str:
-        return "\n".join(
-            [
-                f"<{self.tag}>{self.push}",
-                *[f"{self.pad}{c.html}" for c in self],
-                f"{self.pop}{self.pad}</{self.tag}>",
-            ]
-        )
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        yield f"<{self.tag}>"
+        with ctx.indent():
+            if ctx.compact:
+                yield from ctx.spaced(self)
+            else:
+                for c in self:
+                    yield f"\n{ctx.pad}"
+                    yield from c.chunks(ctx)
+        yield f"</{self.tag}>" if ctx.compact else f"\n{ctx.pad}</{self.tag}>"
 
     @property
     def child(self) -> list:
@@ -33,6 +42,8 @@ class mdList(list, mdType):
 class mdUList(mdList):
     """"""
 
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "ul"
@@ -41,6 +52,8 @@ class mdUList(mdList):
 class mdOList(mdList):
     """"""
 
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "ol"
@@ -49,8 +62,12 @@ class mdOList(mdList):
 class mdListItem(mdTag):
     """"""
 
+    __slots__ = ()
+
     __inline__ = True
 
+    block = True
+
     @property
     def tag(self) -> str:
         return "li"
@@ -1,11 +1,20 @@
 import abc
 
-from .base import mdType
+from .base import mdType, mdContext
+
+
+def renew(base: type, tag: str):
+    """ Unpickling helper for instances of classes made by `mdTag.new`.
+    """
+    cls = base.new(tag)
+    return cls.__new__(cls)
 
 
 class mdTag(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "content")
+
     __tags__ = {}
 
     def __init__(self, *content: tuple):
@@ -16,9 +25,17 @@ class mdTag(mdType):
     def new(cls, tag: str) -> type:
         if tag not in cls.__tags__:
             class mdNewTag(cls):
+                __slots__ = ()
+
                 @property
                 def tag(self):
                     return tag
+
+                def __reduce_ex__(self, protocol: int):
+                    state = object.__reduce_ex__(self, max(protocol, 2))[2]
+                    return (renew, (cls, tag), state)
+            mdNewTag.block = tag in mdContext.BLOCK
+            mdNewTag.neutral = tag in mdContext.NEUTRAL
             cls.__tags__[tag] = mdNewTag
         return cls.__tags__[tag]
 
@@ -28,19 +45,40 @@ class mdTag(mdType):
 
     @property
     def html(self) -> str:
-        if not self.inline:
-            return "\n".join(
-                [
-                    f"<{self.tag}{self.keys}>{self.push}",
-                    *[f"{self.pad}{c.html}" for c in self.content],
-                    f"{self.pop}{self.pad}</{self.tag}>",
-                ]
-            )
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        if ctx.compact:
+            if self.tag in ctx.PRESERVE:
+                with ctx.expanded():
+                    yield from self.chunks(ctx)
+                return
+            ## `mdContext.spaced`, inlined as tags nest deeply and every
+            ## generator level adds to the cost of each chunk
+            yield f"<{self.tag}{self.keys}>"
+            edge = previous = self.block or self.neutral
+            with ctx.indent():
+                for c in self.content:
+                    if c.neutral:
+                        yield from c.chunks(ctx)
+                        continue
+                    if not (previous or c.block):
+                        yield " "
+                    yield from c.chunks(ctx)
+                    previous = c.block
+            if not (previous or edge):
+                yield " "
+            yield f"</{self.tag}>"
+        elif not self.inline:
+            yield f"<{self.tag}{self.keys}>"
+            with ctx.indent():
+                for c in self.content:
+                    yield f"\n{ctx.pad}"
+                    yield from c.chunks(ctx)
+            yield f"\n{ctx.pad}</{self.tag}>"
         else:
-            return " ".join(
-                [
-                    f"<{self.tag}{self.keys}>",
-                    *[f"{c.html}" for c in self.content],
-                    f"</{self.tag}>",
-                ]
-            )
+            yield f"<{self.tag}{self.keys}>"
+            for c in self.content:
+                yield " "
+                yield from c.chunks(ctx)
+            yield f" </{self.tag}>"
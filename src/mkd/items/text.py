@@ -1,10 +1,12 @@
 import abc
 
-from .base import mdType
+from .base import mdType, mdContext
 
 class mdText(list, mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo")
+
     SEP = ''
 
     __inline__ = True
@@ -27,10 +29,43 @@ class mdText(list, mdType):
     def html(self) -> str:
         return str(self.text)
 
+    def chunks(self, ctx: mdContext):
+        for i, c in enumerate(self):
+            if i and self.SEP:
+                yield self.SEP
+            if isinstance(c, mdType):
+                yield from c.chunks(ctx)
+            else:
+                yield str(c)
+
+
+class mdVar(mdType):
+    """ Template variable, looked up in `ctx.variables` at render time.
+    """
+
+    __slots__ = ("_data", "_lexinfo", "name")
+
+    __inline__ = True
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"mdVar({self.name!r})"
+
+    @property
+    def html(self) -> str:
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        yield ctx.variable(self.name)
+
 
 class mdPlainText(mdText):
     """"""
 
+    __slots__ = ()
+
     @property
     def html(self) -> str:
         return str(self.text)
@@ -39,6 +74,8 @@ class mdPlainText(mdText):
 class mdTextTag(mdType):
     """"""
 
+    __slots__ = ("_data", "_lexinfo", "text")
+
     __inline__ = True
 
     def __init__(self, text: mdText):
@@ -51,41 +88,62 @@ class mdTextTag(mdType):
 
     @property
     def html(self) -> str:
-        return f"<{self.tag}{self.keys}>{self.text.html}</{self.tag}>"
+        return "".join(self.iter_html())
+
+    def chunks(self, ctx: mdContext):
+        yield f"<{self.tag}{self.keys}>"
+        yield from self.text.chunks(ctx)
+        yield f"</{self.tag}>"
 
 # Simple Text Elements
 class mdPar(mdTextTag):
+    __slots__ = ()
+
+    block = True
+
     @property
     def tag(self) -> str:
         return "p"
 
 class mdSpan(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "span"
 
 # Text Formatting
 class mdBold(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "b"
 
 class mdItalic(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "i"
 
 class mdStrike(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "s"
 
 class mdDeleted(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "del"
 
 class mdInserted(mdTextTag):
+    __slots__ = ()
+
     @property
     def tag(self) -> str:
         return "ins"
@@ -93,11 +151,15 @@ class mdInserted(mdTextTag):
 class mdCode(mdTextTag):
     """"""
 
+    __slots__ = ()
+
     @property
     def tag(self):
         return 'code'
 
 class mdScript(mdType):
+    __slots__ = ("_data", "_lexinfo", "code")
+
     def __init__(self, code: mdCode):
         self.code = code
 
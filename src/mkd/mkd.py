@@ -1,30 +1,315 @@
 # Standard Library
+import re
 from pathlib import Path
-
-# Third-Party
-from cstream import stderr, stdlog, stdwar, stdout
+from typing import TYPE_CHECKING
 
 # Local
-from .mkdlib import Source
+from .mkdlib import Source, phase, count, stderr, stdlog, stdwar, stdout
+from .error import mdError
+from .items import mdContext, mdContents
 from .mkdparser import mkdParser
 
+if TYPE_CHECKING:
+    from .cache import ParseCache
+
 
 class mkd:
     """"""
 
-    def __init__(self, fname: str):
-        """"""
+    def __init__(self, fname: str, buffer: str=None):
+        """ `buffer`, if given, is used as the contents of `fname`.
+        """
         self.fname = Path(fname).absolute()
 
-        if not self.fname.exists() or not self.fname.is_file():
-            stderr[0] << f"Invalid source file '{self.fname}'."
-            exit(1)
+        if buffer is None and (not self.fname.exists() or not self.fname.is_file()):
+            raise mdError(f"Invalid source file '{self.fname}'.")
+
+        self.source = Source(self.fname, buffer=buffer)
+        self.symbol_table = {}
+
+        ## Filled by `parse`: stamps of included files, variables read from
+        ## outside the file and variables assigned
+        self.depends = {}
+        self.reads = {}
+        self.writes = {}
+
+        ## Includes read ahead of time, see `Parser.sources`
+        self.sources = {}
+
+        ## Item of each markdown line, by line number, filled by `parse`
+        self.markdown_items = {}
+
+    def parse(self, *, ensure_html: bool=True, cache: "ParseCache"=None, template: bool=False):
+        """ Parses the source file. With a `cache`, a stored tree is reused
+            when available and a new one is stored otherwise. In `template`
+            mode, variables not assigned before their use are left to be
+            resolved at render time.
+        """
+        if cache is not None:
+            key = cache.key(self.source, ensure_html, template)
+            entry = cache.load(key)
+            count("parse_cache_hits" if entry is not None else "parse_cache_misses")
+            if entry is None:
+                output = self.parse(ensure_html=ensure_html, template=template)
+                cache.store(key, self.entry(output))
+            else:
+                output = self.restore(entry)
+            return output
+
+        with mkdParser.borrow(self.source) as parser:
+            parser.sources = self.sources
+            output = parser.parse(ensure_html=ensure_html, template=template)
+            self.symbol_table = parser.symbol_table
+            self.depends = parser.depends
+            self.reads = parser.reads
+            self.writes = parser.writes
+            self.markdown_items = parser.markdown_items
+        return output
+
+    def render(self, stream, *, ensure_html: bool=True, cache: "ParseCache"=None, compact: bool=False, assets: dict=None):
+        """ Parses and writes the output to `stream`, without indentation or
+            needless whitespace if `compact`, with loader references replaced
+            as `assets` say. With a `cache`, the rendered output is stored as
+            well and written back verbatim.
+        """
+        ctx = mdContext(compact=compact, assets=assets)
+        if cache is None:
+            output = self.parse(ensure_html=ensure_html)
+            with phase("render"):
+                output.render(stream, ctx)
+            return
+
+        key = cache.key(self.source, ensure_html)
+        entry = cache.load(key)
+        count("parse_cache_hits" if entry is not None else "parse_cache_misses")
+        if entry is not None:
+            output = self.restore(entry)
+            if (
+                entry["html"] is not None
+                and entry.get("compact", False) == compact
+                and entry.get("assets") == assets
+            ):
+                with phase("render"):
+                    stream.write(entry["html"])
+                return
+        else:
+            output = self.parse(ensure_html=ensure_html)
+
+        chunks = []
+        with phase("render"):
+            for chunk in output.iter_html(ctx):
+                stream.write(chunk)
+                chunks.append(chunk)
 
-        self.source = Source(self.fname)
-        self.parser = mkdParser(self.source)
+        cache.store(key, self.entry(output, "".join(chunks), compact, assets))
 
-    def parse(self, *, ensure_html: bool=True):
-        return self.parser.parse(ensure_html=ensure_html)
+    def entry(self, output: object, html: str=None, compact: bool=False, assets: dict=None) -> dict:
+        return {
+            "tree": output,
+            "html": html,
+            "compact": compact,
+            "assets": assets,
+            "symbol_table": self.symbol_table,
+            "depends": self.depends,
+            "reads": self.reads,
+            "writes": self.writes,
+        }
+
+    def restore(self, entry: dict) -> object:
+        self.symbol_table = entry["symbol_table"]
+        self.depends = {path: version for path, (version, _) in entry["depends"].items()}
+        self.reads = entry["reads"]
+        self.writes = entry["writes"]
+        return entry["tree"]
+
+    @property
+    def variables(self) -> set:
+        """ Variables read without ever being given a value, i.e. those left
+            to be given at render time in template mode.
+        """
+        return {key for key, value in self.reads.items() if value is None}
 
     def tokens(self):
-        return self.parser.test()
\ No newline at end of file
+        with mkdParser.borrow(self.source) as parser:
+            return parser.test()
+
+
+class Template:
+    """ A page parsed once, to be rendered against many sets of variables.
+        `variables` are the names it leaves to be given at render time.
+
+        The tree is compiled into a `Renderer` on first use.
+    """
+
+    def __init__(self, tree: object, variables: set, compact: bool=False):
+        self.tree = tree
+        self.variables = variables
+        self.compact = compact
+        self.renderer = None
+
+    def render(self, variables: dict=None, stream=None):
+        """ Writes the output to `stream`, or returns it if there is none.
+        """
+        if self.renderer is None:
+            from .codegen import Renderer
+
+            self.renderer = Renderer.from_tree(self.tree, compact=self.compact)
+        output = self.renderer(variables)
+        if stream is None:
+            return output
+        else:
+            stream.write(output)
+
+
+class Document:
+    """ A page being edited, e.g. in a live preview, whose tree is kept up
+        to date edit by edit instead of parsing the whole page every time.
+
+        An edit that rewrites, inserts or deletes markdown lines, none of
+        them using variables, can't change anything but the items of those
+        lines: only the new lines are parsed, and their items take the place
+        of the old ones in the tree. Any other edit, which may open or close
+        blocks, assign variables or include files, parses the page again.
+        Either way, failures raise `mdError` and leave the last good tree in
+        place, along with the items of the lines that weren't edited, so
+        that later edits of those lines are still patched.
+    """
+
+    ## Markdown lines, as `mkdLexer` reads them, without variables
+    RE_INLINE = re.compile(r"\§(?:\t|[ ]{3})[^\r\n\$]*")
+
+    def __init__(self, fname: str, buffer: str=None, *, ensure_html: bool=True, template: bool=False):
+        """ `buffer`, if given, is used as the contents of `fname`.
+        """
+        m = mkd(fname, buffer=buffer)
+        self.fname = m.fname
+        self.lines = str(m.source).split("\n")
+        self.ensure_html = ensure_html
+        self.template = template
+
+        self.tree = None
+        self.symbol_table = {}
+        self.depends = {}
+        self.reads = {}
+        self.writes = {}
+
+        ## Item of each line, `None` for lines that aren't markdown or that
+        ## were edited since the last good tree, and the list holding each
+        ## item in the tree, by `id`
+        self.items = None
+        self.parents = None
+
+        self.parse()
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def parse(self) -> object:
+        """ Parses the whole page again.
+        """
+        m = mkd(self.fname, buffer=self.text)
+        self.tree = m.parse(ensure_html=self.ensure_html, template=self.template)
+        self.symbol_table = m.symbol_table
+        self.depends = m.depends
+        self.reads = m.reads
+        self.writes = m.writes
+
+        parents = {}
+        stack = [self.tree]
+        while stack:
+            item = stack.pop()
+            children = item if isinstance(item, mdContents) else getattr(item, "content", None)
+            if isinstance(children, list):
+                for child in children:
+                    parents[id(child)] = children
+                    stack.append(child)
+
+        self.items = [m.markdown_items.get(lineno) for lineno in range(1, len(self.lines) + 1)]
+        self.parents = parents
+        return self.tree
+
+    def apply_edit(self, line_range: tuple, new_text: str) -> object:
+        """ Replaces the lines from `start` up to, but not including, `stop`,
+            numbered from 1, by the lines of `new_text`, and returns the
+            updated tree. `(start, start)` inserts lines before line `start`
+            and an empty `new_text` deletes them.
+        """
+        start, stop = line_range
+        if not 1 <= start <= stop <= len(self.lines) + 1:
+            raise mdError(f"Invalid line range {line_range!r} for {len(self.lines)} lines.")
+
+        lines = new_text.split("\n")
+        if lines[-1] == "":
+            lines.pop()
+
+        inline = self.items is not None and all(
+            self.RE_INLINE.fullmatch(line) for line in (*self.lines[start - 1 : stop - 1], *lines)
+        )
+        self.lines[start - 1 : stop - 1] = lines
+
+        if not (inline and self.patch(start, stop, lines)):
+            if self.items is not None:
+                self.items[start - 1 : stop - 1] = [None] * len(lines)
+            self.parse()
+        return self.tree
+
+    def patch(self, start: int, stop: int, lines: list) -> bool:
+        """ Puts the items of the markdown `lines`, now starting at line
+            `start`, in place of those that lines `start` to `stop` had.
+            Lines only inserted go next to the item of the line before them
+            or, failing that, of the line after them. Returns `False`,
+            leaving everything as it was, if that can't be done: when an
+            item was left out of the tree for rendering as nothing, when
+            inserted lines have no such neighbour, when deleted lines would
+            leave their block empty, or when the new lines have errors,
+            which a whole parse then reports.
+        """
+        old = self.items[start - 1 : stop - 1]
+        if not all(old):
+            return False
+
+        if old:
+            anchor, offset = old[0], 0
+        elif start > 1 and self.items[start - 2]:
+            anchor, offset = self.items[start - 2], 1
+        elif start <= len(self.items) and self.items[start - 1]:
+            anchor, offset = self.items[start - 1], 0
+        else:
+            return False
+
+        children = self.parents.get(id(anchor))
+        if children is None:
+            return False
+        index = next((i for i, child in enumerate(children) if child is anchor), None)
+        if index is None or len(children[index : index + len(old)]) != len(old):
+            return False
+        elif any(a is not b for a, b in zip(children[index : index + len(old)], old)):
+            return False
+        index += offset
+        if not lines and len(children) == len(old):
+            return False
+
+        source = Source(str(self.fname), buffer="\n".join(lines))
+        with mkdParser.borrow(source) as parser:
+            parser.symbol_table = dict(self.symbol_table)
+            parser.template = self.template
+            items = parser.markdown(tuple(map(parser.lexer.markdown, lines)), start)
+            if parser.error_stack or not all(items):
+                return False
+
+        children[index : index + len(old)] = items
+        self.items[start - 1 : stop - 1] = items
+        for item in old:
+            self.parents.pop(id(item), None)
+        for item in items:
+            self.parents[id(item)] = children
+        return True
+
+
+def compile(fname: str, *, ensure_html: bool=True, cache: "ParseCache"=None, compact: bool=False) -> Template:
+    """ Parses `fname` in template mode.
+    """
+    m = mkd(fname)
+    tree = m.parse(ensure_html=ensure_html, cache=cache, template=True)
+    return Template(tree, m.variables, compact=compact)
\ No newline at end of file
@@ -1 +1,3 @@
-from .source import Source, track, trackable, TrackType
\ No newline at end of file
+from .source import Source, reason, track, trackable, TrackType
+from .profiler import Profiler, phase, count, peak
+from .streams import stdout, stderr, stdwar, stdlog
\ No newline at end of file
@@ -0,0 +1,182 @@
+## Standard Library
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Profiler(object):
+    """ Wall time per phase and event counters of the code run inside a
+        `with Profiler():` block.
+
+        Phases nest, and time is charged to the innermost one only, so the
+        figures add up to the total. Time spent outside of any phase goes to
+        "other". If `phase` is given, a `cProfile` profiler runs while that
+        phase is the innermost one, for `dump_stats` to save.
+
+        Only one profiler is active at a time, process-wide.
+    """
+
+    PHASES = ("read", "tables", "lex", "parse", "include", "render")
+
+    current = None
+
+    def __init__(self, phase: str = None):
+        self.phase = phase
+        if phase is not None:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+        else:
+            self.cprofile = None
+        self.enabled = False
+
+        self.times = Counter()
+        self.counters = Counter()
+        self.tokens = Counter()
+
+        self.stack = []
+        self.start = None
+        self.last = None
+        self.total = None
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = Profiler.current
+        Profiler.current = self
+        self.start = self.last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.switch()
+        self.total = self.last - self.start
+        while self.stack:
+            self.stack.pop()
+        self.toggle()
+        Profiler.current = self.previous
+
+    def switch(self):
+        """ Charges the time since the last switch to the innermost phase.
+        """
+        now = time.perf_counter()
+        self.times[self.stack[-1] if self.stack else "other"] += now - self.last
+        self.last = now
+
+    def toggle(self):
+        if self.cprofile is not None:
+            enabled = bool(self.stack) and self.stack[-1] == self.phase
+            if enabled and not self.enabled:
+                self.cprofile.enable()
+            elif self.enabled and not enabled:
+                self.cprofile.disable()
+            self.enabled = enabled
+
+    def enter(self, name: str):
+        self.switch()
+        self.stack.append(name)
+        self.toggle()
+
+    def exit(self):
+        self.switch()
+        self.stack.pop()
+        self.toggle()
+
+    def lexer(self, lexer: object) -> "TimedLexer":
+        return TimedLexer(lexer, self)
+
+    def dump_stats(self, path: str):
+        self.cprofile.dump_stats(path)
+
+    def report(self) -> dict:
+        return {
+            "total": self.total,
+            "phases": {name: self.times[name] for name in (*self.PHASES, "other")},
+            "parsers": {
+                name.split(":", 1)[1]: value
+                for name, value in sorted(self.counters.items())
+                if name.startswith("parsers:")
+            },
+            "tokens": dict(self.tokens.most_common()),
+            "includes": self.counters["includes"],
+            "include_depth": self.counters["include_depth"],
+            "include_cache": {
+                "hits": self.counters["include_cache_hits"],
+                "misses": self.counters["include_cache_misses"],
+            },
+            "parse_cache": {
+                "hits": self.counters["parse_cache_hits"],
+                "misses": self.counters["parse_cache_misses"],
+            },
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        total = report["total"] or 0.0
+        lines = ["Phase          Time (ms)   Share"]
+        for name, seconds in report["phases"].items():
+            share = 100 * seconds / total if total else 0.0
+            lines.append(f"{name:<12} {1e3 * seconds:11.3f} {share:6.1f}%")
+        lines.append(f"{'total':<12} {1e3 * total:11.3f}")
+        lines.append("Parsers created: " + (", ".join(f"{k} {v}" for k, v in report["parsers"].items()) or "none"))
+        lines.append(f"Tokens: {sum(report['tokens'].values())} (" + ", ".join(f"{k} {v}" for k, v in report["tokens"].items()) + ")")
+        lines.append(
+            f"Includes: {report['includes']} (max depth {report['include_depth']}), "
+            f"include cache {report['include_cache']['hits']} hits / {report['include_cache']['misses']} misses, "
+            f"parse cache {report['parse_cache']['hits']} hits / {report['parse_cache']['misses']} misses"
+        )
+        return "\n".join(lines)
+
+
+class TimedLexer(object):
+    """ Stands for a PLY lexer during a profiled parse, timing the "lex"
+        phase and counting tokens by type.
+    """
+
+    def __init__(self, lexer: object, profiler: Profiler):
+        self.lexer = lexer
+        self.profiler = profiler
+
+    def input(self, data: str):
+        self.lexer.input(data)
+
+    def token(self):
+        self.profiler.enter("lex")
+        try:
+            token = self.lexer.token()
+        finally:
+            self.profiler.exit()
+        if token is not None:
+            self.profiler.tokens[token.type] += 1
+        return token
+
+    def __getattr__(self, name: str):
+        return getattr(self.lexer, name)
+
+
+@contextmanager
+def phase(name: str):
+    """ Runs the block as phase `name` of the active profiler, if any.
+    """
+    profiler = Profiler.current
+    if profiler is None:
+        yield
+    else:
+        profiler.enter(name)
+        try:
+            yield
+        finally:
+            profiler.exit()
+
+
+def count(name: str, value: int = 1):
+    """ Adds `value` to counter `name` of the active profiler, if any.
+    """
+    if Profiler.current is not None:
+        Profiler.current.counters[name] += value
+
+
+def peak(name: str, value: int):
+    """ Raises counter `name` of the active profiler, if any, to `value`.
+    """
+    if Profiler.current is not None:
+        counters = Profiler.current.counters
+        counters[name] = max(counters[name], value)
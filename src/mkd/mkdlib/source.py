@@ -1,7 +1,11 @@
 ## Standard Library
-from functools import wraps
-import itertools as it
+from array import array
+from bisect import bisect_right
 import os
+import re
+
+## Local
+from .profiler import phase
 
 class EOFType(object):
 
@@ -14,18 +18,31 @@ class EOFType(object):
 
         self.lexinfo = lexinfo
 
+def reason(error: Exception) -> str:
+    """ Why a file couldn't be read, in a few words.
+    """
+    if isinstance(error, UnicodeDecodeError):
+        return f"not valid UTF-8 (byte {error.object[error.start]:#04x} at offset {error.start})"
+    return error.strerror or str(error)
+
 class Source(str):
     """ This source code object aids the tracking of tokens in order to
         indicate error position on exception handling.
     """
 
-    def __new__(cls, fname :str, buffer: str=None):
+    def __new__(cls, fname :str, buffer: str=None, origin: tuple=None):
         """ This object is a string itself with additional features for
-            position tracking.
+            position tracking. `fname` is only read when no `buffer` is given,
+            failing with `mdError` if it can't be read as UTF-8 text.
         """
-        if fname is not None:
-            with open(fname, mode='r', encoding='utf-8') as file:
-                return str.__new__(cls, file.read())
+        if fname is not None and buffer is None:
+            try:
+                with phase('read'), open(fname, mode='r', encoding='utf-8') as file:
+                    return str.__new__(cls, file.read())
+            except (OSError, UnicodeDecodeError) as error:
+                from ..error import mdError
+
+                raise mdError(f"Can't read '{os.path.abspath(fname)}': {reason(error)}.") from error
         else:
             return str.__new__(cls, buffer)
 
@@ -33,23 +50,86 @@ class Source(str):
     def __repr__(self):
         return f"<source @ {self.fname}>"
 
+    def __getnewargs__(self):
+        """ Unpickling must not read `fname` again.
+        """
+        return (None, str(self))
+
     def __bool__(self):
         """ Truth-value for emptiness checking.
         """
         return (str(self) != "")
 
-    def __init__(self, fname : str, buffer: str=None):
-        """ Separates the source code in multiple lines. First line is discarded for
-            the indexing to start at 1 instead of 0. `self.table` keeps track of the
-            (cumulative) character count.
+    RE_NEWLINE = re.compile(r'\n')
+
+    _offsets = None
+
+    def __init__(self, fname : str, buffer: str=None, origin: tuple=None):
+        """ Line information is computed on first use: `self.offsets` holds the
+            offset at which each line starts, lines being numbered from 1, and
+            line text is sliced out of the source when asked for.
+
+            `origin` is given for buffers cut out of another source: it is a pair
+            `(source, offsets)` where `offsets[i]` is the `(lineno, column)` at which
+            line `i + 1` of this buffer starts in `source`.
         """
         self.fname = os.path.abspath(fname) if (fname is not None) else "string"
-        self.lines = ['', *str.split(self, '\n')]
-        self.table = list(it.accumulate([(len(line) + 1) for line in self.lines]))
+        self.origin = origin
+
+    @property
+    def offsets(self) -> array:
+        if self._offsets is None:
+            self._offsets = array('q', [0, *(m.end() for m in self.RE_NEWLINE.finditer(self))])
+        return self._offsets
+
+    @property
+    def count(self) -> int:
+        """ Number of lines.
+        """
+        return len(self.offsets)
+
+    def offset(self, lineno: int) -> int:
+        """ Offset at which line `lineno` starts.
+        """
+        return self.offsets[lineno - 1]
+
+    def line(self, lineno: int) -> str:
+        """ Text of line `lineno`, without its line break.
+        """
+        offsets = self.offsets
+        if not 1 <= lineno <= len(offsets):
+            return str()
+        elif lineno == len(offsets):
+            return str.__getitem__(self, slice(offsets[lineno - 1], None))
+        else:
+            return str.__getitem__(self, slice(offsets[lineno - 1], offsets[lineno] - 1))
+
+    def lineno(self, lexpos: int) -> int:
+        """ Line containing offset `lexpos`.
+        """
+        return bisect_right(self.offsets, lexpos)
+
+    def chrpos(self, lineno: int, lexpos: int) -> int:
+        """ Column of offset `lexpos`, which lies in line `lineno`.
+        """
+        if lineno is None:
+            lineno = self.lineno(lexpos)
+        return lexpos - self.offsets[lineno - 1]
 
     @classmethod
-    def from_str(cls, buffer: str):
-        return cls(None, buffer=buffer)
+    def from_str(cls, buffer: str, origin: tuple=None):
+        return cls(None, buffer=buffer, origin=origin)
+
+    def locate(self, lineno: int, chrpos: int):
+        """ Maps a position in this source back to the file it was taken from.
+            Returns a `(source, lineno, chrpos)` triple.
+        """
+        if self.origin is None or lineno is None:
+            return (self, lineno, chrpos)
+        else:
+            source, offsets = self.origin
+            line, column = offsets[lineno - 1]
+            return source.locate(line, chrpos + column)
 
     @staticmethod
     def load(fname : str):
@@ -62,9 +142,9 @@ class Source(str):
         """
 
         ## SatType lexinfo interface
-        lineno = len(self.lines) - 1
-        lexpos = len(self.lines[lineno]) - 1
-        chrpos = (lexpos - self.table[lineno - 1] + 1)
+        lineno = self.count
+        lexpos = len(self) - 1
+        chrpos = max(0, self.chrpos(lineno, lexpos))
 
         lexinfo = {
             'lineno': lineno,
@@ -76,33 +156,37 @@ class Source(str):
         ## Anonymous object
         return EOFType(lexinfo)
 
+LEXINFO = ('lineno', 'lexpos', 'chrpos', 'source')
+
+NOINFO = (0, 0, 0, None)
+
 def trackable(cls: type):
+    """ Tracking information is packed in a `(lineno, lexpos, chrpos, source)`
+        tuple kept in `_lexinfo`, which is only set for tracked objects. Classes
+        using `__slots__` must provide that slot.
+    """
+
+    def get_lexinfo(self) -> dict:
+        return dict(zip(LEXINFO, getattr(self, '_lexinfo', NOINFO)))
+
+    def set_lexinfo(self, lexinfo: object):
+        if isinstance(lexinfo, dict):
+            lexinfo = tuple(lexinfo[key] for key in LEXINFO)
+        self._lexinfo = lexinfo
+
+    setattr(cls, 'lexinfo', property(get_lexinfo, set_lexinfo))
 
-    init_func = cls.__init__
-    
-    @wraps(init_func)
-    def __init__(self, *args, **kwargs):
-        init_func(self, *args, **kwargs)
-        setattr(self, 'lexinfo', {
-            'lineno': 0,
-            'lexpos': 0,
-            'chrpos': 0,
-            'source': None
-        })
-
-    setattr(cls, '__init__', __init__)
-
-    setattr(cls, 'lineno', property(lambda self: getattr(self, 'lexinfo')['lineno']))
-    setattr(cls, 'lexpos', property(lambda self: getattr(self, 'lexinfo')['lexpos']))
-    setattr(cls, 'chrpos', property(lambda self: getattr(self, 'lexinfo')['chrpos']))
-    setattr(cls, 'source', property(lambda self: getattr(self, 'lexinfo')['source']))
+    setattr(cls, 'lineno', property(lambda self: getattr(self, '_lexinfo', NOINFO)[0]))
+    setattr(cls, 'lexpos', property(lambda self: getattr(self, '_lexinfo', NOINFO)[1]))
+    setattr(cls, 'chrpos', property(lambda self: getattr(self, '_lexinfo', NOINFO)[2]))
+    setattr(cls, 'source', property(lambda self: getattr(self, '_lexinfo', NOINFO)[3]))
 
     return cls
 
 def track(from_: object, to_: object, out: bool=False):
     if hasattr(from_, 'lexinfo'):
         if hasattr(to_, 'lexinfo'):
-            to_.lexinfo.update(from_.lexinfo)
+            to_.lexinfo = from_.lexinfo
             if out: return to_
         else:
             raise AttributeError('`to_` is not trackable, i.e. has no attribute `lexinfo`.')
@@ -113,4 +197,4 @@ def track(from_: object, to_: object, out: bool=False):
 class TrackType(object):
     pass
 
-__all__ = ["Source", "track", "trackable", "TrackType"]
\ No newline at end of file
+__all__ = ["Source", "reason", "track", "trackable", "TrackType"]
\ No newline at end of file
@@ -0,0 +1,27 @@
+class Stream(object):
+    """ Stands for the `cstream` stream `name`, importing `cstream` only once
+        something is written to it.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @property
+    def stream(self):
+        import cstream
+
+        return getattr(cstream, self.name)
+
+    def __getitem__(self, level: int):
+        return self.stream[level]
+
+    def __lshift__(self, s: object):
+        return self.stream << s
+
+
+stdout = Stream("stdout")
+stderr = Stream("stderr")
+stdwar = Stream("stdwar")
+stdlog = Stream("stdlog")
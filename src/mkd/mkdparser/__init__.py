@@ -1 +1,2 @@
-from .mkdparser import mkdParser
\ No newline at end of file
+from .mkdparser import mkdParser
+from .cache import IncludeCache, include_cache
@@ -2,18 +2,21 @@
 """
 ## Standard Library
 import re
+import hashlib
+import importlib
 import itertools as it
-from decimal import Decimal as Number
 from pathlib import Path
 from collections import deque
+from contextlib import contextmanager
 
 ## Third-Party
-from cstream import stderr, stdwar, stdlog, stdout
 from ply import lex, yacc
 
 ## Local
-from ..error import mdSyntaxError, mdError
-from ..mkdlib import Source, track, trackable, TrackType
+from ..error import mdSyntaxError, mdIncludeError, mdParseError, mdError
+from ..mkdlib import Source, reason, track, trackable, TrackType, Profiler, phase, count, peak
+from ..mkdlib import stderr, stdwar, stdlog, stdout
+from .cache import IncludeEntry, include_cache
 
 from ..items import *  # pylint: disable=unused-wildcard-import
 
@@ -32,24 +35,33 @@ class Lexer(object):
 
     RE_FLAGS = re.VERBOSE | re.UNICODE | re.MULTILINE
 
-    def __init__(self, source):
+    def __init__(self, source, lextab: str = None, error_stack: deque = None):
         self.source = source
 
-        self.lexer = lex.lex(object=self, reflags=self.RE_FLAGS, debug=False)
+        if lextab is not None:
+            self.lexer = lex.lex(object=self, reflags=self.RE_FLAGS, debug=False, optimize=True, lextab=lextab)
+        else:
+            self.lexer = lex.lex(object=self, reflags=self.RE_FLAGS, debug=False)
 
-        # Errors
-        self.error_stack = deque([])
+        # Errors, shared with the parser if it gives its own
+        self.error_stack = error_stack if error_stack is not None else deque([])
+
+    def reset(self, source):
+        """ Binds the already built lexer to a new input.
+        """
+        self.source = source
+        self.lexer.lineno = 1
+        self.error_stack.clear()
 
     def __lshift__(self, error):
         self.error_stack.append(error)
 
     def interrupt(self):
-        """"""
-        while self.error_stack:
-            error = self.error_stack.popleft()
-            stderr[0] << error
-        else:
-            exit(1)
+        """ Raises every error collected so far at once.
+        """
+        errors = [*self.error_stack]
+        self.error_stack.clear()
+        raise mdParseError(errors)
 
     def checkpoint(self):
         """"""
@@ -57,16 +69,17 @@ class Lexer(object):
             self.interrupt()
 
     def t_error(self, t):
-        stderr << f"Unknown token '{t.value}' at line {t.lineno}"
-        if t:
-            stderr << f"Syntax Error at line {t.lineno}:"
-            stderr << self.source.lines[t.lineno - 1]
-            stderr << f'{" " * (self.chrpos(t.lineno, t.lexpos))}^'
-        else:
-            stderr << "Unexpected End Of File."
+        """ Records the unknown character and skips it, so that lexing goes
+            on and later errors are found as well.
+        """
+        source, lineno, chrpos = self.source.locate(t.lineno, self.chrpos(t.lineno, t.lexpos))
+        target = TrackType()
+        target.lexinfo = (lineno, t.lexpos, chrpos, source)
+        self << mdSyntaxError(f"Unknown character {t.value[0]!r}.", target=target)
+        t.lexer.skip(1)
 
     def chrpos(self, lineno, lexpos):
-        return lexpos - self.source.table[lineno - 1] + 1
+        return self.source.chrpos(lineno, lexpos)
 
 
 class Parser(object):
@@ -75,13 +88,29 @@ class Parser(object):
 
     tokens: tuple = Lexer.tokens
 
+    include_cache = include_cache
+
+    ## Prefix of the prebuilt table modules in `tables`, `None` for none
+    TABLES: str = None
+
     def __init__(self, source: Source):
         ## Input
         self.source = source
 
+        ## Errors, lexer ones included
+        self.error_stack = deque([])
+
         ## Lex & Yacc
-        self.lexer = self.Lexer(self.source)
-        self.parser = yacc.yacc(module=self, debug=False)
+        with phase("tables"):
+            tables = self.tables()
+            if tables is not None:
+                lextab, parsetab = tables
+                self.lexer = self.Lexer(self.source, lextab=lextab, error_stack=self.error_stack)
+                self.parser = yacc.yacc(module=self, debug=False, write_tables=False, optimize=True, tabmodule=parsetab)
+            else:
+                self.lexer = self.Lexer(self.source, error_stack=self.error_stack)
+                self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+        count(f"parsers:{self.__class__.__name__}")
 
         ## Indent
         self.indent = 0
@@ -89,30 +118,153 @@ class Parser(object):
         ## Look-up table
         self.symbol_table = {}
 
-        ## Output & Errors
+        ## Leave unbound variables to be resolved at render time
+        self.template = False
+
+        ## Variables read from and assigned to the look-up table
+        self.reads = {}
+        self.writes = {}
+
+        ## Files being included, outermost first
+        self.includes = ()
+
+        ## Stamps of every file reached through `include`
+        self.depends = {}
+
+        ## Sources read ahead of time, as `(stamp, source)` pairs by path
+        self.sources = {}
+
+        ## Output
         self.output = None
-        self.error_stack = deque([])
+
+    def reset(self, source: Source):
+        """ Prepares this parser for a new input, keeping the lexer and the
+            LALR tables built in `__init__`.
+        """
+        self.source = source
+        self.lexer.reset(source)
+        self.indent = 0
+        self.symbol_table = {}
+        self.template = False
+        self.reads = {}
+        self.writes = {}
+        self.includes = ()
+        self.depends = {}
+        self.sources = {}
+        self.output = None
+        self.error_stack.clear()
+
+    @classmethod
+    def signature(cls) -> str:
+        """ Digest of what the tables are built from: token names, regexes
+            and flags, literals, precedence and grammar rules. Docstrings of
+            `t_error` and `p_error`, which are prose, are left out, so only
+            a change of the grammar itself makes the tables stale.
+
+            Function rules are also hashed in the order they are defined in,
+            which is the order the lexer tries them.
+        """
+        digest = hashlib.sha256()
+        for klass in (cls, cls.Lexer):
+            for name in ("tokens", "literals", "precedence", "RE_FLAGS"):
+                digest.update(f"{name}={getattr(klass, name, None)!r}\n".encode("utf-8"))
+            rules = []
+            for name in dir(klass):
+                if name.startswith(("p_", "t_")) and name not in ("p_error", "t_error"):
+                    value = getattr(klass, name)
+                    if callable(value):
+                        rules.append((value.__code__.co_firstlineno, name, value.__doc__))
+                    else:
+                        rules.append((0, name, value))
+            for _, name, rule in sorted(rules):
+                digest.update(f"{name}:{rule}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def tables(cls):
+        """ Names of the prebuilt lexer and parser table modules, `None` if
+            there are none or if they were built from another grammar. In the
+            latter case the tables are built at runtime instead.
+        """
+        if "__tables__" not in cls.__dict__:
+            cls.__tables__ = None
+            if cls.TABLES is not None:
+                lextab = f"{__package__}.tables.{cls.TABLES}lextab"
+                parsetab = f"{__package__}.tables.{cls.TABLES}parsetab"
+                try:
+                    signature = importlib.import_module(lextab)._mkd_signature
+                except (ImportError, AttributeError):
+                    signature = None
+                if signature == cls.signature():
+                    cls.__tables__ = (lextab, parsetab)
+        return cls.__tables__
+
+    @classmethod
+    def pool(cls) -> list:
+        """ Idle parsers of this exact class.
+        """
+        if "__pool__" not in cls.__dict__:
+            cls.__pool__ = []
+        return cls.__pool__
+
+    @classmethod
+    def acquire(cls, source: Source):
+        """ Takes an idle parser from the pool, building a new one only when
+            all of them are busy (e.g. while parsing nested includes).
+        """
+        try:
+            parser = cls.pool().pop()
+        except IndexError:
+            return cls(source)
+        else:
+            parser.reset(source)
+            return parser
+
+    @classmethod
+    def prepare(cls):
+        """ Builds an idle instance ahead of time, e.g. when a worker starts.
+        """
+        if not cls.pool():
+            cls.pool().append(cls(None))
+
+    def release(self):
+        """ Gives this parser back to the pool.
+        """
+        self.reset(None)
+        self.pool().append(self)
+
+    @classmethod
+    @contextmanager
+    def borrow(cls, source: Source):
+        parser = cls.acquire(source)
+        try:
+            yield parser
+        finally:
+            parser.release()
 
     def __lshift__(self, error: mdError):
         self.error_stack.append(error)
 
     def interrupt(self):
-        """"""
-        while self.error_stack:
-            error = self.error_stack.popleft()
-            stderr[0] << error
-        else:
-            exit(1)
+        """ Raises every error collected so far at once, as an `mdParseError`.
+            The parser itself stays usable.
+        """
+        errors = [*self.error_stack]
+        self.error_stack.clear()
+        raise mdParseError(errors)
 
     def checkpoint(self):
         """"""
         if self.error_stack:
             self.interrupt()
 
-    def parse(self, ensure_html: bool = True, symbol_table: dict = None):
+    def parse(self, ensure_html: bool = True, symbol_table: dict = None, template: bool = False):
         ## True if main file, False if include
         self.ensure_html = ensure_html
 
+        ## True if variables not assigned so far become `mdVar` placeholders
+        self.template = template
+
         ## Build Symbol Table
         if symbol_table is None:
             self.symbol_table = {}
@@ -121,9 +273,13 @@ class Parser(object):
 
         ## Run Parser
         if not self.source:
-            self << mdSyntaxError("Empty File.", target=self.source.eof)
+            self << mdSyntaxError("Empty File.", target=self.eof())
         else:
-            self.parser.parse(self.source)
+            lexer = self.lexer.lexer
+            if Profiler.current is not None:
+                lexer = Profiler.current.lexer(lexer)
+            with phase("parse"):
+                self.parser.parse(self.source, lexer=lexer)
 
         ## Checkpoint
         self.checkpoint()
@@ -146,73 +302,146 @@ class Parser(object):
         if index is None:
             value = p
             if do_track:
-                value.lexinfo = {
-                    "lineno": None,
-                    "lexpos": None,
-                    "chrpos": None,
-                    "source": self.source,
-                }
+                value.lexinfo = (None, None, None, self.source)
         else:
             value = p[index]
             if do_track:
-                lineno = p.lineno(index)
-                lexpos = p.lexpos(index)
-                value.lexinfo = {
-                    "lineno": lineno,
-                    "lexpos": lexpos,
-                    "chrpos": self.chrpos(lineno, lexpos),
-                    "source": self.source,
-                }
+                value.lexinfo = self.lexinfo(p.lineno(index), p.lexpos(index))
         return value
 
+    def lexinfo(self, lineno: int, lexpos: int) -> tuple:
+        """ Packed `(lineno, lexpos, chrpos, source)` tracking information for a
+            position in the current input, pointing back at the original file
+            when the input is an embedded buffer.
+        """
+        source, line, chrpos = self.source.locate(lineno, self.chrpos(lineno, lexpos))
+        return (line, lexpos, chrpos, source)
+
     def p_error(self, t):
         stderr[3] << f"Error Token: '{t}'"
-        target = TrackType()
         if t:
-            target.lexinfo = {
-                "lineno": t.lineno,
-                "lexpos": t.lexpos,
-                "chrpos": self.chrpos(t.lineno, t.lexpos),
-                "source": self.source,
-            }
+            target = TrackType()
+            target.lexinfo = self.lexinfo(t.lineno, t.lexpos)
             msg = "Invalid Syntax"
         else:
-            lineno = len(self.source.lines) - 1
-            lexpos = len(self.source.lines[lineno]) - 1
-            target.lexinfo = {
-                "lineno": lineno,
-                "lexpos": lexpos,
-                "chrpos": self.chrpos(lineno, lexpos),
-                "source": self.source,
-            }
+            target = self.eof()
             msg = "Unexpected End Of File."
         self << mdSyntaxError(msg=msg, target=target)
         return None
 
+    def eof(self) -> TrackType:
+        """ Target for errors at the end of the input, pointing back at the
+            original file when the input is an embedded buffer, e.g. a `§`
+            line with nothing after it.
+        """
+        eof = self.source.eof
+        source, lineno, chrpos = self.source.locate(eof.lineno, eof.chrpos)
+        target = TrackType()
+        target.lexinfo = (lineno, eof.lexpos, chrpos, source)
+        return target
+
     def chrpos(self, lineno: int, lexpos: int):
-        return lexpos - self.source.table[lineno - 1] + 1
+        return self.source.chrpos(lineno, lexpos)
 
     def set_var(self, key: str, value: object):
         self.symbol_table[key] = value
+        self.writes[key] = value
 
     def get_var(self, key: str):
+        if key not in self.writes and key not in self.reads:
+            self.reads[key] = self.symbol_table.get(key)
+
         if key in self.symbol_table:
             return self.symbol_table[key]
+        elif self.template:
+            return mdVar(key)
         else:
             return mdNull()
 
-    def include(self, path: str):
+    def absorb(self, reads: dict, writes: dict, depends: dict = None):
+        """ Accounts for the variables and files used by an include or an
+            embedded input, as if they had been used here.
+        """
+        if depends:
+            self.depends.update(depends)
+        for key, value in reads.items():
+            if key not in self.writes:
+                self.reads.setdefault(key, value)
+        for key, value in writes.items():
+            self.set_var(key, value)
+
+    def include(self, path: str, target: TrackType = None):
+        with phase("include"):
+            return self.resolve(path, target)
+
+    def resolve(self, path: str, target: TrackType = None):
         path = Path(str(path))
         if not path.exists() or not path.is_file():
+            self.depends[str(path.resolve())] = None
             stdwar[0] << f"File '{path}' not found."
             return mdNull()
-        if path.suffix == ".html":
-            with open(path, mode="r") as file:
-                return mdRawHTML(file.read())
-        elif path.suffix == ".mkd" or path.suffix == ".md":
-            subparser = self.__class__(Source(path))
-            return subparser.parse(ensure_html=False, symbol_table=self.symbol_table)
+
+        path = path.resolve()
+        if self.includes:
+            chain = self.includes
+        elif self.source is not None and self.source.fname != "string":
+            chain = (Path(self.source.fname).resolve(),)
         else:
+            chain = ()
+
+        if path in chain:
+            cycle = " -> ".join(p.name for p in (*chain[chain.index(path):], path))
+            self << mdIncludeError(f"Circular include: {cycle}.", target=target)
+            return mdNull()
+
+        if path.suffix not in (".html", ".mkd", ".md"):
             stdwar[0] << f"Unknown extension '{path.suffix}'."
             return mdNull()
 
+        count("includes")
+        peak("include_depth", len(chain))
+
+        key = self.include_cache.key((self.__class__, self.template), path)
+        entry = self.include_cache.get(key, self.symbol_table)
+        count("include_cache_hits" if entry is not None else "include_cache_misses")
+
+        if entry is None:
+            if path.suffix == ".html":
+                try:
+                    with phase("read"), open(path, mode="r") as file:
+                        entry = IncludeEntry(mdRawHTML(file.read()), {}, {}, {})
+                except (OSError, UnicodeDecodeError) as error:
+                    self << mdIncludeError(f"Can't read '{path}': {reason(error)}.", target=target)
+                    self.depends[str(path)] = key[2]
+                    return mdNull()
+            else:
+                version, source = self.sources.get(str(path), (None, None))
+                if source is None or version != key[2]:
+                    try:
+                        source = Source(path)
+                    except mdError as error:
+                        self << mdIncludeError(error.msg, target=target)
+                        self.depends[str(path)] = key[2]
+                        return mdNull()
+                with self.__class__.borrow(source) as subparser:
+                    subparser.includes = (*chain, path)
+                    subparser.sources = self.sources
+                    try:
+                        output = subparser.parse(
+                            ensure_html=False, symbol_table=self.symbol_table, template=self.template
+                        )
+                    except mdParseError as error:
+                        ## Reported along with the errors of this file
+                        self.error_stack.extend(error.errors)
+                        self.depends[str(path)] = key[2]
+                        return mdNull()
+                    entry = IncludeEntry(
+                        output, subparser.reads, subparser.writes, subparser.depends
+                    )
+            self.include_cache.put(key, entry)
+
+        self.depends[str(path)] = key[2]
+        self.absorb(entry.reads, entry.writes, entry.depends)
+
+        return entry.output
+
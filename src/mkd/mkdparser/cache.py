@@ -0,0 +1,181 @@
+"""
+"""
+## Standard Library
+import os
+import threading
+from pathlib import Path
+from collections import Counter, OrderedDict
+
+
+def stamp(path: str):
+    """ Identity of a file's current version, `None` if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    else:
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+class IncludeEntry(object):
+    """ A parsed include: its output, the variables it read from the including
+        file (with the values seen), the ones it assigned and the stamps of the
+        files it included in turn.
+    """
+
+    __slots__ = ("output", "reads", "writes", "depends")
+
+    def __init__(self, output: object, reads: dict, writes: dict, depends: dict):
+        self.output = output
+        self.reads = reads
+        self.writes = writes
+        self.depends = depends
+
+    @property
+    def names(self) -> tuple:
+        """ Variables read, in a fixed order.
+        """
+        return tuple(sorted(self.reads))
+
+    def matches(self, symbol_table: dict) -> bool:
+        return all(
+            symbol_table.get(key) == value for key, value in self.reads.items()
+        ) and all(
+            stamp(path) == value for path, value in self.depends.items()
+        )
+
+
+class IncludeSlot(object):
+    """ Entries of a single version of a file, by the variables they read
+        and the values seen, least recently used first.
+    """
+
+    __slots__ = ("version", "entries", "names")
+
+    def __init__(self, version: tuple):
+        self.version = version
+        self.entries = OrderedDict()
+
+        ## How many entries read each set of variables
+        self.names = Counter()
+
+
+class IncludeCache(object):
+    """ Process-wide cache of parsed includes.
+
+        Entries are filed under the file identity, i.e. resolved path,
+        modification time and size, and under the values of the variables
+        the include read, so that a lookup is one `dict` access for every
+        set of variables the file's entries read (almost always a single
+        one). Entries for an older version of a file are dropped as soon as
+        a newer one is stored.
+
+        At most `max_per_file` entries are kept for a file and `max_entries`
+        in all, evicting the least recently used ones.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_per_file: int = 64):
+        self.max_entries = max_entries
+        self.max_per_file = max_per_file
+        self.slots = {}
+
+        ## `(slot key, names, values)` of every entry, least recently used first
+        self.order = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: object, path: Path) -> tuple:
+        return (kind, str(path), stamp(path))
+
+    @staticmethod
+    def values(names: tuple, symbol_table: dict):
+        """ Hashable values of `names` in `symbol_table`, `None` if some
+            value can't be hashed, and so can't be looked up.
+        """
+        values = tuple(symbol_table.get(name) for name in names)
+        try:
+            hash(values)
+        except TypeError:
+            return None
+        return values
+
+    def get(self, key: tuple, symbol_table: dict):
+        with self.lock:
+            slot = self.slots.get(key[:2])
+            if slot is not None and slot.version == key[2]:
+                for names in slot.names:
+                    values = self.values(names, symbol_table)
+                    entry = slot.entries.get((names, values)) if values is not None else None
+                    if entry is not None and entry.matches(symbol_table):
+                        slot.entries.move_to_end((names, values))
+                        self.order.move_to_end((key[:2], names, values))
+                        self.hits += 1
+                        return entry
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, entry: IncludeEntry):
+        names = entry.names
+        values = self.values(names, entry.reads)
+        if values is None:
+            return
+        with self.lock:
+            slot = self.slots.get(key[:2])
+            if slot is None or slot.version != key[2]:
+                if slot is not None:
+                    self.drop(key[:2], slot)
+                slot = self.slots[key[:2]] = IncludeSlot(key[2])
+
+            if (names, values) in slot.entries:
+                slot.names[names] -= 1
+            slot.entries[(names, values)] = entry
+            slot.entries.move_to_end((names, values))
+            slot.names[names] += 1
+            self.order[(key[:2], names, values)] = None
+            self.order.move_to_end((key[:2], names, values))
+
+            if len(slot.entries) > self.max_per_file:
+                self.evict(key[:2], *next(iter(slot.entries)))
+            while len(self.order) > self.max_entries:
+                self.evict(*next(iter(self.order)))
+
+    def evict(self, file: tuple, names: tuple, values: tuple):
+        """ Drops the entry of `file` for the given values of `names`.
+        """
+        slot = self.slots[file]
+        del slot.entries[(names, values)]
+        del self.order[(file, names, values)]
+        slot.names[names] -= 1
+        if not slot.names[names]:
+            del slot.names[names]
+        if not slot.entries:
+            del self.slots[file]
+
+    def drop(self, file: tuple, slot: IncludeSlot):
+        """ Drops every entry of `file`.
+        """
+        for names, values in slot.entries:
+            del self.order[(file, names, values)]
+        del self.slots[file]
+
+    def clear(self):
+        with self.lock:
+            self.slots.clear()
+            self.order.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.order),
+            }
+
+
+include_cache = IncludeCache()
@@ -3,17 +3,16 @@
 ## Standard Library
 import re
 import itertools as it
-from decimal import Decimal as Number
 from pathlib import Path
 from collections import deque
 
 ## Third-Party
-from cstream import stderr, stdwar, stdlog, stdout
 from ply import lex, yacc
 
 ## Local
 from ..error import mdSyntaxError, mdError
 from ..mkdlib import Source, track, trackable, TrackType
+from ..mkdlib import stderr, stdwar, stdlog, stdout
 
 from ..items import *  # pylint: disable=unused-wildcard-import
 
@@ -24,6 +23,7 @@ class mdLexer(Lexer):
 
     ## List of token names.
     tokens = (
+        "LINE",
         "VAR",
  #       "BACK",
         "WORD",
@@ -32,7 +32,6 @@ class mdLexer(Lexer):
         "LPAR",
         "RPAR",
         "ESCAPE",
-        "SPACE",
         "UNDER",
         "TILDE",
         "AST",
@@ -55,6 +54,11 @@ class mdLexer(Lexer):
         map(lambda token, escape=ESCAPE_CHAR: f"{escape}{token}", ESCAPE_TOKENS)
     )
 
+    @regex(r"\n")
+    def t_LINE(self, t):
+        self.lexer.lineno += 1
+        return t
+
     @regex(r"\$[a-zA-Z0-9\_]+")
     def t_VAR(self, t):
         t.value = str(t.value[1:])
@@ -65,13 +69,14 @@ class mdLexer(Lexer):
         t.value = t.value[1:]
         return t
 
-    @regex(r"[^\s\r\n\[\]\(\)\*\_\\\~]")
-    def t_WORD(self, t):
-        return t
+    RE_SPACE = re.compile(r"[^\S\r\n]", re.UNICODE)
 
-    @regex(r"[^\S\r\n]")
-    def t_SPACE(self, t):
-        t.value = " "
+    @regex(r"(?:[^\r\n\[\]\(\)\*\_\\\~\$]|\$(?![a-zA-Z0-9\_]))+")
+    def t_WORD(self, t):
+        """ Maximal run of plain characters, spaces included. Only markup,
+            escapes and variables break it.
+        """
+        t.value = self.RE_SPACE.sub(" ", t.value)
         return t
 
 
@@ -79,9 +84,21 @@ class mdParser(Parser):
     Lexer = mdLexer
     tokens = mdLexer.tokens
 
+    TABLES = "md"
+
     def p_start(self, p):
-        """start : markdown"""
-        self.retrieve(p[1])
+        """start : lines"""
+        self.retrieve(tuple(p[1]))
+
+    def p_lines(self, p):
+        """lines : lines LINE markdown
+        | markdown
+        """
+        if len(p) == 4:
+            p[1].append(p[3])
+            p[0] = p[1]
+        else:
+            p[0] = [p[1]]
 
     def p_markdown(self, p):
         """markdown : markdown element
@@ -94,8 +111,7 @@ class mdParser(Parser):
             p[0] = mdPlainText(p[1])
 
     def p_element(self, p):
-        """element : text
-        | link
+        """element : link
         | effect
         """
         if len(p) == 2:
@@ -103,17 +119,21 @@ class mdParser(Parser):
         else:
             p[0] = mdNull()
 
+    def p_element_text(self, p):
+        """element : text"""
+        p[0] = self.run(p[1])
+
     def p_effect_italic(self, p):
         """effect : UNDER text UNDER"""
-        p[0] = mdItalic(p[2])
+        p[0] = mdItalic(self.run(p[2]))
 
     def p_effect_bold(self, p):
         """effect : AST text AST"""
-        p[0] = mdBold(p[2])
+        p[0] = mdBold(self.run(p[2]))
 
     def p_effect_strike(self, p):
         """effect : TILDE text TILDE"""
-        p[0] = mdStrike(p[2])
+        p[0] = mdStrike(self.run(p[2]))
 
     def p_text(self, p):
         """text : text word
@@ -123,14 +143,13 @@ class mdParser(Parser):
             p[1].append(p[2])
             p[0] = p[1]
         else:
-            p[0] = mdText(p[1])
+            p[0] = [p[1]]
 
     def p_word(self, p):
         """word : WORD
-        | SPACE
         | ESCAPE
         """
-        p[0] = mdText(p[1])
+        p[0] = p[1]
 
     def p_word_var(self, p):
         """word : VAR"""
@@ -138,4 +157,18 @@ class mdParser(Parser):
 
     def p_link(self, p):
         """link : LBRA text RBRA LPAR text RPAR"""
-        p[0] = mdLink(p[2], p[5])
\ No newline at end of file
+        p[0] = mdLink(self.run(p[2]), self.run(p[5]))
+
+    def run(self, words: list) -> mdText:
+        """ Flattens the words of a text into a single string-backed node.
+            Template variables are kept apart, between the strings around them.
+        """
+        if self.template:
+            items = []
+            for var, group in it.groupby(words, key=lambda w: isinstance(w, mdVar)):
+                if var:
+                    items.extend(group)
+                else:
+                    items.append("".join(w if isinstance(w, str) else w.html for w in group))
+            return mdText(*items)
+        return mdText("".join(w if isinstance(w, str) else w.html for w in words))
\ No newline at end of file
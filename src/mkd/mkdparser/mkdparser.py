@@ -3,22 +3,21 @@
 ## Standard Library
 import re
 import itertools as it
-from decimal import Decimal as Number
 from pathlib import Path
 from collections import deque
 
 ## Third-Party
-from cstream import stderr, stdwar, stdlog, stdout
 from ply import lex, yacc
 
 ## Local
-from ..error import mdSyntaxError, mdError
+from ..error import mdSyntaxError, mdParseError, mdError
 from ..mkdlib import Source, track, trackable, TrackType
+from ..mkdlib import stderr, stdwar, stdlog, stdout
 
 from ..items import *  # pylint: disable=unused-wildcard-import
 
 from .base import Lexer, Parser, regex
-from .mdparser import mdParser
+from .mdparser import mdLexer, mdParser
 
 class mkdLexer(Lexer):
 
@@ -68,15 +67,25 @@ class mkdLexer(Lexer):
         t.value = (m.group(2), m.group(1))
         return t
 
-    @regex(r'^\§(\t|[ ]{3})[^\r\n]*$')
+    @regex(r'^\§(\t|[ ]{3})[^\r\n]*(?:\n\§(?:\t|[ ]{3})[^\r\n]*)*$')
     def t_MARKDOWN(self, t):
-        s = str(t.value[1:])
-        if s[0] == '\t':
-            t.value = s[1:]
-        else:
-            t.value = s[3:]
+        """ A run of adjacent markdown lines is a single token whose value
+            holds a `(text, column)` pair for each line.
+        """
+        lines = tuple(map(self.markdown, t.value.split('\n')))
+        t.value = lines
+        t.lexer.lineno += len(lines) - 1
         return t
 
+    @staticmethod
+    def markdown(line: str) -> tuple:
+        """ `(text, column)` of a markdown line.
+        """
+        if line[1] == '\t':
+            return (line[2:], 2)
+        else:
+            return (line[4:], 4)
+
     @regex(r'^\/(\t|[ ]{3})[^\r\n]*$')
     def t_INCLUDE(self, t):
         s = str(t.value[1:])
@@ -119,12 +128,67 @@ class mkdParser(Parser):
     Lexer = mkdLexer
     tokens = mkdLexer.tokens
 
+    TABLES = "mkd"
+
+    ## Include and loader lines, found without parsing, e.g. to read ahead
+    RE_INCLUDE = re.compile(r"^\/(?:\t|[ ]{3})([^\r\n]*)$", re.MULTILINE)
+    RE_LOADER = re.compile(r"^\@([a-z]+)[^\S\r\n]+([^\r\n]*)$", re.MULTILINE)
+
+    ## Any of these sends a markdown line through `mdParser`
+    RE_MARKUP = re.compile(r"[\*\_\~\[\]\(\)\\\$]")
+
+    ## Markdown lines rendered without (plain) and with (markup) `mdParser`
+    __stats__ = {"plain": 0, "markup": 0}
+
     def __init__(self, source: Source):
         Parser.__init__(self, source)
 
-    def markdown(self, s: str):
-        md_parser = mdParser(Source.from_str(s))
-        return md_parser.parse(symbol_table=self.symbol_table)
+        ## Item of each markdown line of `source`, by line number
+        self.markdown_items = {}
+
+    def reset(self, source: Source):
+        Parser.reset(self, source)
+        self.markdown_items = {}
+
+    def markdown(self, lines: tuple, lineno: int) -> tuple:
+        """ Turns a block of adjacent markdown lines into one item per line.
+            `lineno` is the line where the block starts, so that errors still
+            point at `self.source`.
+
+            Lines without any markup character become text right away. The
+            remaining ones are joined and parsed in a single `mdParser` run.
+        """
+        items = [None] * len(lines)
+        markup = []
+        for i, (text, _) in enumerate(lines):
+            if text and self.RE_MARKUP.search(text) is None:
+                items[i] = mdPlainText(mdText(mdLexer.RE_SPACE.sub(" ", text)))
+            else:
+                markup.append(i)
+
+        self.__stats__["plain"] += len(lines) - len(markup)
+        self.__stats__["markup"] += len(markup)
+
+        if markup:
+            offsets = [(lineno + i, lines[i][1]) for i in markup]
+            source = Source.from_str(
+                "\n".join(lines[i][0] for i in markup), origin=(self.source, offsets)
+            )
+            with mdParser.borrow(source) as md_parser:
+                try:
+                    output = md_parser.parse(symbol_table=self.symbol_table, template=self.template)
+                except mdParseError as error:
+                    ## Reported with the errors of this file, which parsing goes on to find
+                    self.error_stack.extend(error.errors)
+                    output = [mdNull()] * len(markup)
+                self.absorb(md_parser.reads, md_parser.writes)
+            for i, item in zip(markup, output):
+                items[i] = item
+
+        for i, item in enumerate(items):
+            self.markdown_items[lineno + i] = item
+
+        return tuple(items)
 
     def p_start(self, p):
         """start : file"""
@@ -191,10 +255,16 @@ class mkdParser(Parser):
                 | codeline
         """
         if len(p) == 3:
-            p[1].append(p[2])
+            if isinstance(p[2], tuple):
+                p[1].extend(p[2])
+            else:
+                p[1].append(p[2])
             p[0] = p[1]
         else:
-            p[0] = mdContents(p[1])
+            if isinstance(p[1], tuple):
+                p[0] = mdContents(*p[1])
+            else:
+                p[0] = mdContents(p[1])
     
     def p_codeline(self, p):
         """codeline : content LINE
@@ -222,11 +292,13 @@ class mkdParser(Parser):
 
     def p_markdown(self, p):
         """markdown : MARKDOWN"""
-        p[0] = self.markdown(p[1])
+        p[0] = self.markdown(p[1], p.lineno(1))
 
     def p_include(self, p):
         """include : INCLUDE"""
-        p[0] = self.include(p[1])
+        target = TrackType()
+        target.lexinfo = self.lexinfo(p.lineno(1), p.lexpos(1))
+        p[0] = self.include(p[1], target=target)
 
     def p_load(self, p):
         """load : LOAD"""
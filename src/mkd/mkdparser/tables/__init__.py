@@ -0,0 +1,7 @@
+""" Lexer and parser tables built ahead of time, one pair of modules per
+    parser class, so that starting up doesn't rebuild them.
+
+    Regenerate them after changing a grammar with:
+
+        python -m mkd.mkdparser.tables.build
+"""
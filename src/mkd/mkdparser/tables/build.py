@@ -0,0 +1,74 @@
+""" Writes the prebuilt tables of every parser next to this module.
+
+    Usage: python -m mkd.mkdparser.tables.build [--check]
+
+    With `--check`, nothing is written: exits with status 1 if the tables
+    of any parser are missing or were built from another grammar.
+"""
+## Standard Library
+import os
+import sys
+import argparse
+from pathlib import Path
+
+## Third-Party
+from ply import yacc
+
+## Local
+from ..mkdparser import mkdParser
+from ..mdparser import mdParser
+
+PARSERS = (mkdParser, mdParser)
+
+
+def build(cls: type, path: Path):
+    """ Writes the `lextab` and `parsetab` modules of `cls` under `path`,
+        tagged with the signature of its grammar.
+    """
+    lextab = path / f"{cls.TABLES}lextab.py"
+    parsetab = path / f"{cls.TABLES}parsetab.py"
+    for fname in (lextab, parsetab):
+        if fname.exists():
+            fname.unlink()
+        sys.modules.pop(f"{__package__}.{fname.stem}", None)
+
+    ## Built from the grammar itself, whatever tables were there before
+    cls.__tables__ = None
+    parser = cls(None)
+    parser.lexer.lexer.writetab(lextab.stem, str(path))
+    yacc.yacc(
+        module=parser, debug=False, write_tables=True, tabmodule=f"{__package__}.{parsetab.stem}", outputdir=str(path)
+    )
+    del cls.__tables__
+
+    with open(lextab, mode="a", encoding="utf-8") as file:
+        file.write(f"_mkd_signature = {cls.signature()!r}\n")
+
+    return (lextab, parsetab)
+
+
+def check() -> list:
+    """ Parsers whose prebuilt tables can't be used.
+    """
+    return [cls for cls in PARSERS if cls.tables() is None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only check that the tables are up to date.")
+    args = parser.parse_args()
+
+    if args.check:
+        stale = check()
+        for cls in stale:
+            print(f"Tables of {cls.__name__} are stale, run 'python -m {__package__}.build'.")
+        sys.exit(1 if stale else 0)
+
+    path = Path(__file__).parent
+    for cls in PARSERS:
+        for fname in build(cls, path):
+            print(os.path.relpath(fname))
+
+
+if __name__ == "__main__":
+    main()
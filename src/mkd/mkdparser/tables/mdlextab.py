@@ -0,0 +1,11 @@
+# mdlextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AST', 'ESCAPE', 'LBRA', 'LINE', 'LPAR', 'RBRA', 'RPAR', 'TILDE', 'UNDER', 'VAR', 'WORD'))
+_lexreflags   = 104
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_LINE>\\n)|(?P<t_VAR>\\$[a-zA-Z0-9\\_]+)|(?P<t_ESCAPE>\\\\\\*|\\\\\\\\|\\\\\\[|\\\\\\]|\\\\\\(|\\\\\\)|\\\\\\_|\\\\\\~)|(?P<t_WORD>(?:[^\\r\\n\\[\\]\\(\\)\\*\\_\\\\\\~\\$]|\\$(?![a-zA-Z0-9\\_]))+)|(?P<t_AST>\\*)|(?P<t_LBRA>\\[)|(?P<t_LPAR>\\()|(?P<t_RBRA>\\])|(?P<t_RPAR>\\))|(?P<t_TILDE>\\~)|(?P<t_UNDER>\\_)', [None, ('t_LINE', 'LINE'), ('t_VAR', 'VAR'), ('t_ESCAPE', 'ESCAPE'), ('t_WORD', 'WORD'), (None, 'AST'), (None, 'LBRA'), (None, 'LPAR'), (None, 'RBRA'), (None, 'RPAR'), (None, 'TILDE'), (None, 'UNDER')])]}
+_lexstateignore = {'INITIAL': ''}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_mkd_signature = '4cd0f5f9eb9dfe450b250e1508a1384914f0f50784a4d8eeaff460d8a87b1e12'
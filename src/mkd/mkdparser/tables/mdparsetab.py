@@ -0,0 +1,47 @@
+
+# mdparsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AST ESCAPE LBRA LINE LPAR RBRA RPAR TILDE UNDER VAR WORDstart : lineslines : lines LINE markdown\n        | markdown\n        markdown : markdown element\n        | element\n        element : link\n        | effect\n        element : texteffect : UNDER text UNDEReffect : AST text ASTeffect : TILDE text TILDEtext : text word\n        | word\n        word : WORD\n        | ESCAPE\n        word : VARlink : LBRA text RBRA LPAR text RPAR'
+    
+_lr_action_items = {'LBRA':([0,3,4,5,6,7,12,13,14,15,16,17,18,23,25,26,27,30,],[8,8,-5,-6,-7,-8,-13,-14,-15,-16,8,-4,-12,8,-9,-10,-11,-17,]),'UNDER':([0,3,4,5,6,7,12,13,14,15,16,17,18,20,23,25,26,27,30,],[9,9,-5,-6,-7,-8,-13,-14,-15,-16,9,-4,-12,25,9,-9,-10,-11,-17,]),'AST':([0,3,4,5,6,7,12,13,14,15,16,17,18,21,23,25,26,27,30,],[10,10,-5,-6,-7,-8,-13,-14,-15,-16,10,-4,-12,26,10,-9,-10,-11,-17,]),'TILDE':([0,3,4,5,6,7,12,13,14,15,16,17,18,22,23,25,26,27,30,],[11,11,-5,-6,-7,-8,-13,-14,-15,-16,11,-4,-12,27,11,-9,-10,-11,-17,]),'WORD':([0,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,25,26,27,28,29,30,],[13,13,-5,-6,-7,13,13,13,13,13,-13,-14,-15,-16,13,-4,-12,13,13,13,13,13,-9,-10,-11,13,13,-17,]),'ESCAPE':([0,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,25,26,27,28,29,30,],[14,14,-5,-6,-7,14,14,14,14,14,-13,-14,-15,-16,14,-4,-12,14,14,14,14,14,-9,-10,-11,14,14,-17,]),'VAR':([0,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,25,26,27,28,29,30,],[15,15,-5,-6,-7,15,15,15,15,15,-13,-14,-15,-16,15,-4,-12,15,15,15,15,15,-9,-10,-11,15,15,-17,]),'$end':([1,2,3,4,5,6,7,12,13,14,15,17,18,23,25,26,27,30,],[0,-1,-3,-5,-6,-7,-8,-13,-14,-15,-16,-4,-12,-2,-9,-10,-11,-17,]),'LINE':([2,3,4,5,6,7,12,13,14,15,17,18,23,25,26,27,30,],[16,-3,-5,-6,-7,-8,-13,-14,-15,-16,-4,-12,-2,-9,-10,-11,-17,]),'RBRA':([12,13,14,15,18,19,],[-13,-14,-15,-16,-12,24,]),'RPAR':([12,13,14,15,18,29,],[-13,-14,-15,-16,-12,30,]),'LPAR':([24,],[28,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'start':([0,],[1,]),'lines':([0,],[2,]),'markdown':([0,16,],[3,23,]),'element':([0,3,16,23,],[4,17,4,17,]),'link':([0,3,16,23,],[5,5,5,5,]),'effect':([0,3,16,23,],[6,6,6,6,]),'text':([0,3,8,9,10,11,16,23,28,],[7,7,19,20,21,22,7,7,29,]),'word':([0,3,7,8,9,10,11,16,19,20,21,22,23,28,29,],[12,12,18,12,12,12,12,12,18,18,18,18,12,12,18,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> start","S'",1,None,None,None),
+  ('start -> lines','start',1,'p_start','mdparser.py',90),
+  ('lines -> lines LINE markdown','lines',3,'p_lines','mdparser.py',94),
+  ('lines -> markdown','lines',1,'p_lines','mdparser.py',95),
+  ('markdown -> markdown element','markdown',2,'p_markdown','mdparser.py',104),
+  ('markdown -> element','markdown',1,'p_markdown','mdparser.py',105),
+  ('element -> link','element',1,'p_element','mdparser.py',114),
+  ('element -> effect','element',1,'p_element','mdparser.py',115),
+  ('element -> text','element',1,'p_element_text','mdparser.py',123),
+  ('effect -> UNDER text UNDER','effect',3,'p_effect_italic','mdparser.py',127),
+  ('effect -> AST text AST','effect',3,'p_effect_bold','mdparser.py',131),
+  ('effect -> TILDE text TILDE','effect',3,'p_effect_strike','mdparser.py',135),
+  ('text -> text word','text',2,'p_text','mdparser.py',139),
+  ('text -> word','text',1,'p_text','mdparser.py',140),
+  ('word -> WORD','word',1,'p_word','mdparser.py',149),
+  ('word -> ESCAPE','word',1,'p_word','mdparser.py',150),
+  ('word -> VAR','word',1,'p_word_var','mdparser.py',155),
+  ('link -> LBRA text RBRA LPAR text RPAR','link',6,'p_link','mdparser.py',159),
+]
@@ -0,0 +1,11 @@
+# mkdlextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ASSIGNMENT', 'BODY', 'DIV_CLASS', 'DIV_ID', 'DIV_POP', 'DIV_PUSH', 'EQ', 'HEAD', 'HTML', 'INCLUDE', 'LINE', 'LOAD', 'MARKDOWN', 'NAME', 'STRING'))
+_lexreflags   = 104
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_LINE>\\n)|(?P<t_COMMENT>^\\#[^\\r\\n]*$)|(?P<t_HTML>^html$)|(?P<t_HEAD>^head$)|(?P<t_BODY>^body$)|(?P<t_DIV_PUSH>^\\{[^\\S\\r\\n]*([a-zA-Z0-9\\_\\-\\+]*))|(?P<t_DIV_POP>^\\}$)|(?P<t_LOAD>^\\@([a-z]+)[^\\S\\r\\n]+([^\\n]*)$)|(?P<t_MARKDOWN>^\\§(\\t|[ ]{3})[^\\r\\n]*(?:\\n\\§(?:\\t|[ ]{3})[^\\r\\n]*)*$)|(?P<t_INCLUDE>^\\/(\\t|[ ]{3})[^\\r\\n]*$)|(?P<t_ASSIGNMENT>^\\$(\\t|[ ]{3}))|(?P<t_STRING>\\"[^\\"\\r\\n]*\\"|\\\'[^\\\'\\r\\n]*\\\')|(?P<t_DIV_CLASS>\\.[a-zA-Z0-9\\_\\-]+)|(?P<t_DIV_ID>\\#[a-zA-Z0-9\\_\\-]+)|(?P<t_NAME>[a-zA-Z0-9_]+)|(?P<t_EQ>\\=)', [None, ('t_LINE', 'LINE'), ('t_COMMENT', 'COMMENT'), ('t_HTML', 'HTML'), ('t_HEAD', 'HEAD'), ('t_BODY', 'BODY'), ('t_DIV_PUSH', 'DIV_PUSH'), None, ('t_DIV_POP', 'DIV_POP'), ('t_LOAD', 'LOAD'), None, None, ('t_MARKDOWN', 'MARKDOWN'), None, ('t_INCLUDE', 'INCLUDE'), None, ('t_ASSIGNMENT', 'ASSIGNMENT'), None, ('t_STRING', 'STRING'), ('t_DIV_CLASS', 'DIV_CLASS'), ('t_DIV_ID', 'DIV_ID'), ('t_NAME', 'NAME'), (None, 'EQ')])]}
+_lexstateignore = {'INITIAL': ' '}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_mkd_signature = '263f1d59227779ba4939318c5e6b8df444fd937ed36fbf1fbcd9ffdfda6fc48c'
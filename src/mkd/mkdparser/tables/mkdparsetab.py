@@ -0,0 +1,64 @@
+
+# mkdparsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ASSIGNMENT BODY DIV_CLASS DIV_ID DIV_POP DIV_PUSH EQ HEAD HTML INCLUDE LINE LOAD MARKDOWN NAME STRINGstart : filefile : html\n                | head body\n                | head\n                | body\n                | code\n        html : HTML LINE code head body\n                | HTML LINE code head\n                | HTML LINE code\n        html : HTML LINE head body\n                | HTML LINE head\n                | HTML LINE body\n        head : HEAD LINE codebody : BODY LINE codecode : code codeline\n                | codeline\n        codeline : content LINE\n                    | content\n        content : assignment\n                   | markdown\n                   | include\n                   | load\n                   | div\n                   |\n        assignment : ASSIGNMENT NAME EQ STRINGmarkdown : MARKDOWNinclude : INCLUDEload : LOADdiv : DIV_PUSH div_options LINE code DIV_POP\n        div_options : div_options div_option\n                       | div_option\n                       |\n        div_option : DIV_IDdiv_option : DIV_CLASS'
+    
+_lr_action_items = {'HTML':([0,],[7,]),'HEAD':([0,10,11,12,13,14,15,16,18,19,20,23,24,27,33,43,46,],[8,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,8,-17,8,-25,-29,]),'BODY':([0,4,10,11,12,13,14,15,16,18,19,20,23,24,25,27,34,36,41,43,46,],[9,9,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,9,-24,-17,9,-13,9,-25,-29,]),'LINE':([0,6,7,8,9,10,11,12,13,14,15,16,18,19,20,21,23,24,25,26,27,29,30,31,32,33,36,37,39,40,43,44,46,],[-24,-24,24,25,26,-16,27,-19,-20,-21,-22,-23,-26,-27,-28,-32,-15,-24,-24,-24,-17,39,-31,-33,-34,-24,-24,-24,-24,-30,-25,-24,-29,]),'ASSIGNMENT':([0,6,10,11,12,13,14,15,16,18,19,20,23,24,25,26,27,33,36,37,39,43,44,46,],[17,17,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,17,17,17,-17,17,17,17,17,-25,17,-29,]),'MARKDOWN':([0,6,10,11,12,13,14,15,16,18,19,20,23,24,25,26,27,33,36,37,39,43,44,46,],[18,18,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,18,18,18,-17,18,18,18,18,-25,18,-29,]),'INCLUDE':([0,6,10,11,12,13,14,15,16,18,19,20,23,24,25,26,27,33,36,37,39,43,44,46,],[19,19,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,19,19,19,-17,19,19,19,19,-25,19,-29,]),'LOAD':([0,6,10,11,12,13,14,15,16,18,19,20,23,24,25,26,27,33,36,37,39,43,44,46,],[20,20,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,20,20,20,-17,20,20,20,20,-25,20,-29,]),'DIV_PUSH':([0,6,10,11,12,13,14,15,16,18,19,20,23,24,25,26,27,33,36,37,39,43,44,46,],[21,21,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,21,21,21,-17,21,21,21,21,-25,21,-29,]),'$end':([0,1,2,3,4,5,6,10,11,12,13,14,15,16,18,19,20,22,23,24,25,26,27,33,34,35,36,37,41,42,43,45,46,],[-24,0,-1,-2,-4,-5,-6,-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-3,-15,-24,-24,-24,-17,-9,-11,-12,-13,-14,-8,-10,-25,-7,-29,]),'DIV_POP':([10,11,12,13,14,15,16,18,19,20,23,27,39,43,44,46,],[-16,-18,-19,-20,-21,-22,-23,-26,-27,-28,-15,-17,-24,-25,46,-29,]),'NAME':([17,],[28,]),'DIV_ID':([21,29,30,31,32,40,],[31,31,-31,-33,-34,-30,]),'DIV_CLASS':([21,29,30,31,32,40,],[32,32,-31,-33,-34,-30,]),'EQ':([28,],[38,]),'STRING':([38,],[43,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'start':([0,],[1,]),'file':([0,],[2,]),'html':([0,],[3,]),'head':([0,24,33,],[4,34,41,]),'body':([0,4,24,34,41,],[5,22,35,42,45,]),'code':([0,24,25,26,39,],[6,33,36,37,44,]),'codeline':([0,6,24,25,26,33,36,37,39,44,],[10,23,10,10,10,23,23,23,10,23,]),'content':([0,6,24,25,26,33,36,37,39,44,],[11,11,11,11,11,11,11,11,11,11,]),'assignment':([0,6,24,25,26,33,36,37,39,44,],[12,12,12,12,12,12,12,12,12,12,]),'markdown':([0,6,24,25,26,33,36,37,39,44,],[13,13,13,13,13,13,13,13,13,13,]),'include':([0,6,24,25,26,33,36,37,39,44,],[14,14,14,14,14,14,14,14,14,14,]),'load':([0,6,24,25,26,33,36,37,39,44,],[15,15,15,15,15,15,15,15,15,15,]),'div':([0,6,24,25,26,33,36,37,39,44,],[16,16,16,16,16,16,16,16,16,16,]),'div_options':([21,],[29,]),'div_option':([21,29,],[30,40,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> start","S'",1,None,None,None),
+  ('start -> file','start',1,'p_start','mkdparser.py',194),
+  ('file -> html','file',1,'p_file','mkdparser.py',198),
+  ('file -> head body','file',2,'p_file','mkdparser.py',199),
+  ('file -> head','file',1,'p_file','mkdparser.py',200),
+  ('file -> body','file',1,'p_file','mkdparser.py',201),
+  ('file -> code','file',1,'p_file','mkdparser.py',202),
+  ('html -> HTML LINE code head body','html',5,'p_html_code','mkdparser.py',224),
+  ('html -> HTML LINE code head','html',4,'p_html_code','mkdparser.py',225),
+  ('html -> HTML LINE code','html',3,'p_html_code','mkdparser.py',226),
+  ('html -> HTML LINE head body','html',4,'p_html','mkdparser.py',236),
+  ('html -> HTML LINE head','html',3,'p_html','mkdparser.py',237),
+  ('html -> HTML LINE body','html',3,'p_html','mkdparser.py',238),
+  ('head -> HEAD LINE code','head',3,'p_head','mkdparser.py',246),
+  ('body -> BODY LINE code','body',3,'p_body','mkdparser.py',250),
+  ('code -> code codeline','code',2,'p_code','mkdparser.py',254),
+  ('code -> codeline','code',1,'p_code','mkdparser.py',255),
+  ('codeline -> content LINE','codeline',2,'p_codeline','mkdparser.py',270),
+  ('codeline -> content','codeline',1,'p_codeline','mkdparser.py',271),
+  ('content -> assignment','content',1,'p_content','mkdparser.py',276),
+  ('content -> markdown','content',1,'p_content','mkdparser.py',277),
+  ('content -> include','content',1,'p_content','mkdparser.py',278),
+  ('content -> load','content',1,'p_content','mkdparser.py',279),
+  ('content -> div','content',1,'p_content','mkdparser.py',280),
+  ('content -> <empty>','content',0,'p_content','mkdparser.py',281),
+  ('assignment -> ASSIGNMENT NAME EQ STRING','assignment',4,'p_assignment','mkdparser.py',289),
+  ('markdown -> MARKDOWN','markdown',1,'p_markdown','mkdparser.py',294),
+  ('include -> INCLUDE','include',1,'p_include','mkdparser.py',298),
+  ('load -> LOAD','load',1,'p_load','mkdparser.py',304),
+  ('div -> DIV_PUSH div_options LINE code DIV_POP','div',5,'p_div','mkdparser.py',309),
+  ('div_options -> div_options div_option','div_options',2,'p_div_options','mkdparser.py',322),
+  ('div_options -> div_option','div_options',1,'p_div_options','mkdparser.py',323),
+  ('div_options -> <empty>','div_options',0,'p_div_options','mkdparser.py',324),
+  ('div_option -> DIV_ID','div_option',1,'p_div_option_id','mkdparser.py',340),
+  ('div_option -> DIV_CLASS','div_option',1,'p_div_option_class','mkdparser.py',344),
+]
@@ -0,0 +1,220 @@
+""" Local HTTP server, rendering pages on demand.
+"""
+## Standard Library
+import os
+import hashlib
+import threading
+import mimetypes
+from pathlib import Path
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+
+## Local
+from ..mkd import mkd
+from ..error import mdError
+from ..items import mdContext
+from ..cache import ParseCache
+from ..mkdparser import mkdParser
+from ..mkdparser.mdparser import mdParser
+from ..mkdparser.cache import stamp
+
+
+class Page(object):
+    """ A rendered page, with the stamps of the files it was rendered from.
+    """
+
+    __slots__ = ("body", "etag", "depends")
+
+    def __init__(self, body: bytes, depends: dict):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.depends = depends
+
+    def valid(self) -> bool:
+        return all(stamp(path) == value for path, value in self.depends.items())
+
+
+class PageCache(object):
+    """ Rendered pages, least recently used first, adding up to at most
+        `max_size` bytes.
+    """
+
+    def __init__(self, max_size: int = 64 * 2 ** 20):
+        self.max_size = max_size
+        self.size = 0
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path: str):
+        """ The page rendered from `path`, `None` if there is none or if any
+            of its sources changed since.
+        """
+        with self.lock:
+            page = self.pages.get(path)
+            if page is None:
+                return None
+            self.pages.move_to_end(path)
+
+        if page.valid():
+            return page
+
+        with self.lock:
+            if self.pages.get(path) is page:
+                del self.pages[path]
+                self.size -= len(page.body)
+        return None
+
+    def put(self, path: str, page: Page):
+        if len(page.body) > self.max_size:
+            return
+        with self.lock:
+            previous = self.pages.pop(path, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self.pages[path] = page
+            self.size += len(page.body)
+            while self.size > self.max_size:
+                _, page = self.pages.popitem(last=False)
+                self.size -= len(page.body)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """ Serves `.mkd` pages under the site root as HTML and files under
+        `static/` as they are.
+    """
+
+    server_version = "mkd"
+
+    STATIC = "static"
+
+    def do_GET(self):
+        self.respond(body=True)
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def respond(self, body: bool):
+        path = self.resolve(unquote(urlsplit(self.path).path))
+
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        if path.suffix == ".mkd":
+            try:
+                page = self.server.page(str(path))
+            except mdError as error:
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Failed to render '{path.name}'", str(error))
+                return
+            except Exception as error:
+                self.log_error("Failed to render '%s': %r", path.name, error)
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Failed to render '{path.name}'")
+                return
+            content = page.body
+            etag = page.etag
+            ctype = "text/html; charset=utf-8"
+        else:
+            try:
+                with open(path, mode="rb") as file:
+                    content = file.read()
+            except OSError:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            version = stamp(str(path))
+            etag = f'"{version[0]:x}-{version[1]:x}"' if version is not None else None
+            ctype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        if self.fresh(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(content)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(content)
+
+    def fresh(self, etag: str) -> bool:
+        """ Whether the client already has the version tagged `etag`.
+        """
+        header = self.headers.get("If-None-Match")
+        if header is None or etag is None:
+            return False
+        tags = {tag.strip() for tag in header.split(",")}
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    def resolve(self, url: str):
+        """ File serving `url`: `static/` files as they are, and for anything
+            else the matching `.mkd` page, `index.mkd` for folders.
+        """
+        root = self.server.root
+        parts = [part for part in url.split("/") if part]
+        if any(part.startswith(".") for part in parts):
+            return None
+
+        path = root.joinpath(*parts)
+        if parts and parts[0] == self.STATIC:
+            candidates = [path]
+        elif path.suffix in (".html", ".htm"):
+            candidates = [path.with_suffix(".mkd")]
+        elif path.suffix == ".mkd":
+            candidates = [path]
+        else:
+            candidates = [path.with_name(path.name + ".mkd"), path / "index.mkd"]
+
+        for candidate in candidates:
+            candidate = candidate.resolve()
+            if candidate.is_file() and root in candidate.parents:
+                return candidate
+        return None
+
+
+class Server(ThreadingHTTPServer):
+    """ Renders the pages of the site under `root` on request.
+
+        Rendered pages are kept in a `PageCache` of up to `max_size` bytes
+        and served from it, without parsing, while the page and every file
+        it includes are unchanged.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, root: str, address: tuple = ("127.0.0.1", 8000), max_size: int = 64 * 2 ** 20, cache_dir: str = None,
+        compact: bool = False,
+    ):
+        self.root = Path(root).resolve()
+        self.compact = compact
+        self.pages = PageCache(max_size)
+        self.cache = ParseCache(cache_dir) if cache_dir is not None else None
+
+        ## Includes are resolved from the site root, as in `mkd build`
+        os.chdir(self.root)
+        mkdParser.prepare()
+        mdParser.prepare()
+
+        ThreadingHTTPServer.__init__(self, address, Handler)
+
+    def page(self, path: str) -> Page:
+        """ The page rendered from `path`. Raises `mdError` if it fails, with
+            the server and its parsers left ready for the next request.
+        """
+        page = self.pages.get(path)
+        if page is not None:
+            return page
+
+        version = stamp(path)
+        m = mkd(path)
+        output = m.parse(ensure_html=True, cache=self.cache)
+        body = "".join((*output.iter_html(mdContext(compact=self.compact)), "\n")).encode("utf-8")
+
+        page = Page(body, {path: version, **m.depends})
+        self.pages.put(path, page)
+        return page
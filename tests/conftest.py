@@ -0,0 +1,5 @@
+## Standard Library
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[1] / "src"))
@@ -0,0 +1,19 @@
+## Standard Library
+import os
+import stat
+
+## Local
+from mkd.builder.builder import write
+
+
+def test_write_umask(tmp_path):
+    """ Output files get the permissions the umask leaves, as `open` gives.
+    """
+    mask = os.umask(0o027)
+    try:
+        write(tmp_path / "page.html", b"<html></html>")
+    finally:
+        os.umask(mask)
+    assert stat.S_IMODE((tmp_path / "page.html").stat().st_mode) == 0o640
+    assert (tmp_path / "page.html").read_bytes() == b"<html></html>"
+    assert os.listdir(tmp_path) == ["page.html"]
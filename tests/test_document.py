@@ -0,0 +1,55 @@
+## Third-Party
+import pytest
+
+## Local
+from mkd.mkd import mkd, Document
+from mkd.error import mdError
+
+PAGE = "html\n\nhead\n§   <title> Page </title>\n\nbody\n§   one\n{   div\n§   two\n§   three\n}\n§   four\n"
+
+
+def html(doc: Document) -> str:
+    return mkd(doc.fname, buffer=doc.text).parse().html
+
+
+def no_parse(doc: Document):
+    raise AssertionError("parsed the whole page")
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        ((9, 10), "§   _two_"),
+        ((9, 9), "§   one and a half\n§   *more*"),
+        ((11, 11), "§   three and a half"),
+        ((13, 13), "§   five"),
+        ((9, 10), ""),
+        ((9, 11), "§   two and three"),
+    ],
+)
+def test_patch(tmp_path, monkeypatch, edit):
+    """ Markdown lines rewritten, inserted or deleted are patched in place.
+    """
+    doc = Document(tmp_path / "page.mkd", buffer=PAGE)
+    monkeypatch.setattr(Document, "parse", no_parse)
+    tree = doc.apply_edit(*edit)
+    assert tree.html == html(doc)
+    assert len(doc.items) == len(doc.lines)
+
+
+def test_patch_after_error(tmp_path, monkeypatch):
+    """ A failed edit keeps the items of the other lines, which are still
+        patched, until the page parses again.
+    """
+    doc = Document(tmp_path / "page.mkd", buffer=PAGE)
+    with pytest.raises(mdError):
+        doc.apply_edit((8, 9), "")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Document, "parse", no_parse)
+        doc.apply_edit((11, 12), "§   _four_")
+        doc.apply_edit((8, 8), "§   one and a half")
+
+    tree = doc.apply_edit((9, 9), "{   div")
+    assert "<i>four</i>" in tree.html
+    assert tree.html == html(doc)
@@ -0,0 +1,30 @@
+## Third-Party
+import pytest
+
+## Local
+from mkd.mkd import mkd
+from mkd.error import mdParseError
+
+
+@pytest.mark.parametrize(
+    "code, line",
+    [
+        ("body\n§   \n", 2),
+        ("body\n§   one\n§   \n§   two\n", 3),
+        ("body\n§   *one*\n\n§\t\n", 4),
+    ],
+)
+def test_empty_markdown_line(tmp_path, code, line):
+    """ An empty `§` line is reported at its own line of the file, not at
+        the buffer it is parsed from.
+    """
+    path = tmp_path / "page.mkd"
+    path.write_text(code, encoding="utf-8")
+
+    with pytest.raises(mdParseError) as info:
+        mkd(str(path)).parse()
+
+    (error,) = info.value.diagnostics()
+    assert error["file"] == str(path)
+    assert error["line"] == line
+    assert error["message"] == "Empty File."
@@ -0,0 +1,48 @@
+## Local
+from mkd.mkd import mkd
+from mkd.mkdparser import include_cache
+
+
+def page(path, title: str):
+    path.write_text(f'html\n$   title = "{title}"\n\nhead\n/   head.mkd\n\nbody\n§   hello\n', encoding="utf-8")
+    return str(path)
+
+
+def test_bounded(tmp_path, monkeypatch):
+    """ An include reading a variable that differs on every page keeps at
+        most `max_per_file` entries, and pages repeating a value hit.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "head.mkd").write_text("§   <title> $title </title>\n", encoding="utf-8")
+    include_cache.clear()
+
+    count = 3 * include_cache.max_per_file
+    for i in range(count):
+        html = mkd(page(tmp_path / f"p{i}.mkd", f"Page {i}")).parse().html
+        assert f"Page {i}" in html
+
+    stats = include_cache.stats()
+    assert stats["entries"] == include_cache.max_per_file
+    assert stats["misses"] == count
+
+    html = mkd(page(tmp_path / "again.mkd", f"Page {count - 1}")).parse().html
+    assert f"Page {count - 1}" in html
+    assert include_cache.stats()["hits"] == 1
+
+
+def test_bounded_overall(tmp_path, monkeypatch):
+    """ Entries of many files add up to at most `max_entries`.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(include_cache, "max_entries", 16)
+    include_cache.clear()
+
+    for i in range(40):
+        (tmp_path / f"head{i}.mkd").write_text("§   <title> $title </title>\n", encoding="utf-8")
+        (tmp_path / f"p{i}.mkd").write_text(
+            f'html\n$   title = "{i}"\n\nhead\n/   head{i}.mkd\n\nbody\n§   hello\n', encoding="utf-8"
+        )
+        mkd(str(tmp_path / f"p{i}.mkd")).parse()
+
+    assert include_cache.stats()["entries"] == 16
+    include_cache.clear()
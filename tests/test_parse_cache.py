@@ -0,0 +1,32 @@
+## Standard Library
+import os
+
+## Local
+from mkd.builder import Builder
+
+
+def test_touched_include(tmp_path):
+    """ A page whose include is touched but not changed is up to date again
+        after one build.
+    """
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "index.mkd").write_text("html\n\nhead\n/   head.mkd\n\nbody\n§   hello\n", encoding="utf-8")
+    head = src / "head.mkd"
+    head.write_text("§   <title> Home </title>\n", encoding="utf-8")
+
+    def build() -> dict:
+        return Builder(src, tmp_path / "out", jobs=1, cache_dir=tmp_path / "cache").build()
+
+    assert build()["built"] == 1
+    assert build()["skipped"] == 1
+
+    info = head.stat()
+    os.utime(head, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+    summary = build()
+    assert summary["built"] == 1
+    assert summary["written"] == 0
+
+    summary = build()
+    assert summary["built"] == 0
+    assert summary["skipped"] == 1